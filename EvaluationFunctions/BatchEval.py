@@ -0,0 +1,93 @@
+import sys
+import chess
+import numpy as np
+from typing import List, Sequence, Tuple
+from EvaluationFunctions.IncrementalBoard import TERMS
+
+"""Vectorised material + PST evaluation of many positions at once"""
+
+
+# Plane order: white P, N, B, R, Q, K, then black P, N, B, R, Q, K
+PLANES = [
+    (color, piece_type)
+    for color in (chess.WHITE, chess.BLACK)
+    for piece_type in chess.PIECE_TYPES
+]
+
+
+def _build_weights(term: int) -> np.ndarray:
+    """Flatten one signed per-square term into a (12 * 64,) weight vector."""
+    weights = np.zeros((len(PLANES), 64), dtype=np.float64)
+    for plane, key in enumerate(PLANES):
+        weights[plane] = [values[term] for values in TERMS[key]]
+    return weights.reshape(-1)
+
+
+# Same score as IncrementalBoard.pst_score / the PST evaluators
+PST_WEIGHTS = _build_weights(1)
+# The same with the endgame tables (IncrementalBoard.pst_score_eg)
+PST_ENDGAME_WEIGHTS = _build_weights(4)
+# Plain material in pawn units, as in MaterialBalance
+MATERIAL_WEIGHTS = _build_weights(0)
+
+
+def board_bitboards(board: chess.Board) -> List[int]:
+    """The twelve piece bitboards of a position in plane order."""
+    return [board.pieces_mask(piece_type, color) for color, piece_type in PLANES]
+
+
+def boards_to_planes(boards: Sequence[chess.Board]) -> np.ndarray:
+    """Convert positions to an (N, 12, 64) uint8 array of piece planes."""
+    bitboards = np.array([board_bitboards(b) for b in boards], dtype=np.uint64)
+    bitboards = bitboards.reshape(len(boards), len(PLANES))
+    # Little-endian bytes so bit i of each bitboard lands on square i
+    as_bytes = bitboards.astype("<u8").view(np.uint8)
+    as_bytes = as_bytes.reshape(len(boards), len(PLANES), 8)
+    return np.unpackbits(as_bytes, axis=-1, bitorder="little")
+
+
+def board_to_planes(board: chess.Board) -> np.ndarray:
+    """Convert one position to a (12, 64) array of piece planes."""
+    return boards_to_planes([board])[0]
+
+
+def evaluate_batch(
+    boards: Sequence[chess.Board], weights: np.ndarray = PST_WEIGHTS
+) -> np.ndarray:
+    """Score positions from White's point of view with one matrix product."""
+    if not boards:
+        return np.zeros(0, dtype=np.float64)
+    planes = boards_to_planes(boards).reshape(len(boards), -1)
+    return planes @ weights
+
+
+def load_epd(path: str) -> List[chess.Board]:
+    """Read positions from an EPD file, skipping blank lines and comments."""
+    boards = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            board, _ = chess.Board.from_epd(line)
+            boards.append(board)
+    return boards
+
+
+def evaluate_epd(
+    path: str, weights: np.ndarray = PST_WEIGHTS, chunk_size: int = 4096
+) -> Tuple[List[chess.Board], np.ndarray]:
+    """Score every position in an EPD file, in chunks to bound memory."""
+    boards = load_epd(path)
+    scores = [
+        evaluate_batch(boards[i : i + chunk_size], weights)
+        for i in range(0, len(boards), chunk_size)
+    ]
+    return boards, np.concatenate(scores) if scores else np.zeros(0)
+
+
+if __name__ == "__main__":
+    # Usage: python -m EvaluationFunctions.BatchEval positions.epd
+    boards, scores = evaluate_epd(sys.argv[1])
+    for board, score in zip(boards, scores):
+        print(f"{score:+.2f}\t{board.epd()}")
@@ -0,0 +1,142 @@
+import chess
+
+"""Precomputed bitboard masks for the evaluators"""
+
+
+# All squares on the adjacent files of each file
+ADJACENT_FILES = [
+    (chess.BB_FILES[file - 1] if file > 0 else 0)
+    | (chess.BB_FILES[file + 1] if file < 7 else 0)
+    for file in range(8)
+]
+
+
+def _ranks_ahead(color: chess.Color, rank: int) -> chess.Bitboard:
+    """All squares on ranks strictly in front of ``rank`` for ``color``."""
+    mask = 0
+    ranks = range(rank + 1, 8) if color == chess.WHITE else range(0, rank)
+    for r in ranks:
+        mask |= chess.BB_RANKS[r]
+    return mask
+
+
+def _ranks_behind(color: chess.Color, rank: int) -> chess.Bitboard:
+    """All squares on ranks strictly behind ``rank`` for ``color``."""
+    return _ranks_ahead(not color, rank)
+
+
+# FORWARD_FILE[color][square]: squares ahead on the same file
+FORWARD_FILE = [[0] * 64 for _ in chess.COLORS]
+# PASSED_SPAN[color][square]: squares ahead on the same and adjacent files
+PASSED_SPAN = [[0] * 64 for _ in chess.COLORS]
+# SUPPORT_SPAN[color][square]: squares behind on the adjacent files
+SUPPORT_SPAN = [[0] * 64 for _ in chess.COLORS]
+
+for _color in chess.COLORS:
+    for _square in chess.SQUARES:
+        _file = chess.square_file(_square)
+        _rank = chess.square_rank(_square)
+        _ahead = _ranks_ahead(_color, _rank)
+        FORWARD_FILE[_color][_square] = _ahead & chess.BB_FILES[_file]
+        PASSED_SPAN[_color][_square] = _ahead & (
+            chess.BB_FILES[_file] | ADJACENT_FILES[_file]
+        )
+        SUPPORT_SPAN[_color][_square] = (
+            _ranks_behind(_color, _rank) & ADJACENT_FILES[_file]
+        )
+
+
+def relative_rank(color: chess.Color, square: chess.Square) -> int:
+    """Rank of ``square`` counted from ``color``'s own back rank."""
+    rank = chess.square_rank(square)
+    return rank if color == chess.WHITE else 7 - rank
+
+
+# Files c-f on ranks 3-6
+CENTER_BOX = 0
+for _square in chess.SQUARES:
+    if 2 <= chess.square_file(_square) <= 5 and 2 <= chess.square_rank(_square) <= 5:
+        CENTER_BOX |= chess.BB_SQUARES[_square]
+
+
+def pawn_attacks(board: chess.Board, color: chess.Color) -> chess.Bitboard:
+    """All squares attacked by ``color``'s pawns."""
+    pawns = board.pawns & board.occupied_co[color]
+    if color == chess.WHITE:
+        attacks = ((pawns << 7) & ~chess.BB_FILE_H) | ((pawns << 9) & ~chess.BB_FILE_A)
+    else:
+        attacks = ((pawns >> 9) & ~chess.BB_FILE_H) | ((pawns >> 7) & ~chess.BB_FILE_A)
+    return attacks & chess.BB_ALL
+
+
+def piece_targets(
+    board: chess.Board, square: chess.Square, color: chess.Color
+) -> chess.Bitboard:
+    """Pseudo-legal destination squares for the piece on ``square``."""
+    if not board.pawns & chess.BB_SQUARES[square]:
+        return board.attacks_mask(square) & ~board.occupied_co[color]
+
+    enemy = board.occupied_co[not color]
+    if board.ep_square is not None and board.turn == color:
+        enemy |= chess.BB_SQUARES[board.ep_square]
+    targets = chess.BB_PAWN_ATTACKS[color][square] & enemy
+
+    step = 8 if color == chess.WHITE else -8
+    single = square + step
+    if 0 <= single < 64 and not board.occupied & chess.BB_SQUARES[single]:
+        targets |= chess.BB_SQUARES[single]
+        start_rank = 1 if color == chess.WHITE else 6
+        double = single + step
+        if (
+            chess.square_rank(square) == start_rank
+            and not board.occupied & chess.BB_SQUARES[double]
+        ):
+            targets |= chess.BB_SQUARES[double]
+
+    return targets
+
+
+def _box(square: chess.Square, radius: int) -> chess.Bitboard:
+    """Squares within ``radius`` files and ranks of ``square``."""
+    mask = 0
+    file = chess.square_file(square)
+    rank = chess.square_rank(square)
+    for r in range(max(0, rank - radius), min(8, rank + radius + 1)):
+        for f in range(max(0, file - radius), min(8, file + radius + 1)):
+            mask |= chess.BB_SQUARES[chess.square(f, r)]
+    return mask
+
+
+# KING_ZONE[square]: 5x5 box around a king on ``square``
+KING_ZONE = [_box(square, 2) for square in chess.SQUARES]
+
+# KING_FILES[square]: file masks of the king's file and its neighbours
+KING_FILES = [
+    [
+        chess.BB_FILES[f]
+        for f in range(
+            max(0, chess.square_file(square) - 1),
+            min(8, chess.square_file(square) + 2),
+        )
+    ]
+    for square in chess.SQUARES
+]
+
+# PAWN_SHIELD[color][square]: the three squares directly in front of the king
+# PAWN_SHIELD_WIDE[color][square]: the same three files, two ranks deep
+PAWN_SHIELD = [[0] * 64 for _ in chess.COLORS]
+PAWN_SHIELD_WIDE = [[0] * 64 for _ in chess.COLORS]
+
+for _color in chess.COLORS:
+    _step = 1 if _color == chess.WHITE else -1
+    for _square in chess.SQUARES:
+        _files = 0
+        for _mask in KING_FILES[_square]:
+            _files |= _mask
+        _rank = chess.square_rank(_square)
+        for _depth in (1, 2):
+            _r = _rank + _step * _depth
+            if 0 <= _r < 8:
+                if _depth == 1:
+                    PAWN_SHIELD[_color][_square] = _files & chess.BB_RANKS[_r]
+                PAWN_SHIELD_WIDE[_color][_square] |= _files & chess.BB_RANKS[_r]
@@ -0,0 +1,71 @@
+import chess
+from typing import Dict, List, Optional, Sequence
+from EvaluationFunctions.IncrementalBoard import zobrist_key
+from EvaluationFunctions.Rollout import has_legal_move, is_insufficient_material
+
+"""Cheap game-over checks for the search hot path"""
+
+
+class RepetitionHistory:
+    """Zobrist keys of the positions of a game, kept in step with push/pop.
+
+    Only positions since the last capture or pawn move can repeat, so a
+    history built from a board only replays that part of its move stack.
+    """
+
+    def __init__(self, board: Optional[chess.Board] = None):
+        self.keys: List[int] = []
+        self.counts: Dict[int, int] = {}
+        if board is not None:
+            board = board.copy()
+            keys = [zobrist_key(board)]
+            for _ in range(min(board.halfmove_clock, len(board.move_stack))):
+                board.pop()
+                keys.append(zobrist_key(board))
+            for key in reversed(keys):
+                self._add(key)
+
+    def _add(self, key: int) -> None:
+        self.keys.append(key)
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+    def push(self, board: chess.Board) -> None:
+        """Record the position after a move was pushed on board."""
+        self._add(zobrist_key(board))
+
+    def pop(self) -> None:
+        """Forget the latest position, after a move was popped."""
+        key = self.keys.pop()
+        self.counts[key] -= 1
+
+    def repetitions(self) -> int:
+        """How often the latest position has occurred."""
+        return self.counts.get(self.keys[-1], 0) if self.keys else 0
+
+
+def game_outcome(
+    board: chess.Board,
+    moves: Optional[Sequence[chess.Move]] = None,
+    history: Optional[RepetitionHistory] = None,
+) -> Optional[chess.Outcome]:
+    """Outcome of the game at board, or None if it goes on.
+
+    The rules are those of ``board.outcome()``: mate, stalemate,
+    insufficient material, the 75-move rule and fivefold repetition, but
+    much cheaper. ``moves`` is the legal move list if the caller already
+    has it; otherwise move generation stops at the first legal move.
+    Material is judged by piece counts, and repetition is only checked
+    with a ``history`` of the game.
+    """
+    stuck = not moves if moves is not None else not has_legal_move(board)
+    if stuck:
+        if board.is_check():
+            return chess.Outcome(chess.Termination.CHECKMATE, not board.turn)
+        return chess.Outcome(chess.Termination.STALEMATE, None)
+    if is_insufficient_material(board):
+        return chess.Outcome(chess.Termination.INSUFFICIENT_MATERIAL, None)
+    if board.halfmove_clock >= 150:
+        return chess.Outcome(chess.Termination.SEVENTYFIVE_MOVES, None)
+    if history is not None and history.repetitions() >= 5:
+        return chess.Outcome(chess.Termination.FIVEFOLD_REPETITION, None)
+    return None
@@ -0,0 +1,272 @@
+import chess
+import chess.polyglot
+from EvaluationFunctions.PieceSquareTables import (
+    piece_score,
+    piece_values,
+    endgame_piece_values,
+    material_values,
+    PST_MIDGAME,
+    PST_ENDGAME,
+)
+
+
+def _build_terms():
+    """Precompute signed (material, pst, midgame, endgame, endgame pst) terms."""
+    terms = {}
+    for color in chess.COLORS:
+        sign = 1 if color == chess.WHITE else -1
+        for piece_type in chess.PIECE_TYPES:
+            key = (color, piece_type)
+            symbol = chess.Piece(piece_type, color).symbol().upper()
+            base = piece_score.get(symbol, 0)
+            terms[key] = [
+                (
+                    sign * material_values.get(piece_type, 0),
+                    sign * (base + midgame),
+                    sign * piece_values[piece_type],
+                    sign * endgame_piece_values[piece_type],
+                    sign * (base + endgame),
+                )
+                for midgame, endgame in zip(PST_MIDGAME[key], PST_ENDGAME[key])
+            ]
+    return terms
+
+
+TERMS = _build_terms()
+
+# Polyglot Zobrist keys per (color, piece_type) and square
+ZOBRIST_PIECES = {
+    (color, piece_type): [
+        chess.polyglot.POLYGLOT_RANDOM_ARRAY[
+            64 * ((piece_type - 1) * 2 + (1 if color else 0)) + square
+        ]
+        for square in chess.SQUARES
+    ]
+    for color in chess.COLORS
+    for piece_type in chess.PIECE_TYPES
+}
+
+_hasher = chess.polyglot.ZobristHasher(chess.polyglot.POLYGLOT_RANDOM_ARRAY)
+
+
+class IncrementalBoard(chess.Board):
+    """chess.Board that keeps material and PST sums updated on push/pop.
+
+    All sums are from White's point of view:
+    ``material`` in pawn units, ``pst_score`` as material plus piece-square
+    bonus (the PST evaluators' score), ``pst_score_eg`` the same with the
+    endgame tables, and ``material_mg``/``material_eg`` in centipawns with
+    the midgame and endgame piece values.
+    ``zobrist_pieces`` is the piece part of the polyglot Zobrist key.
+    """
+
+    def __init__(self, fen=chess.STARTING_FEN, *, chess960=False):
+        self.material = 0
+        self.pst_score = 0.0
+        self.pst_score_eg = 0.0
+        self.material_mg = 0
+        self.material_eg = 0
+        self.zobrist_pieces = 0
+        self._score_stack = []
+        super().__init__(fen, chess960=chess960)
+
+    @classmethod
+    def from_board(cls, board: chess.Board) -> "IncrementalBoard":
+        """Wrap an existing board, keeping its move stack."""
+        if isinstance(board, cls):
+            return board.copy()
+
+        incremental = cls(None, chess960=board.chess960)
+        incremental.pawns = board.pawns
+        incremental.knights = board.knights
+        incremental.bishops = board.bishops
+        incremental.rooks = board.rooks
+        incremental.queens = board.queens
+        incremental.kings = board.kings
+        incremental.occupied_co[chess.WHITE] = board.occupied_co[chess.WHITE]
+        incremental.occupied_co[chess.BLACK] = board.occupied_co[chess.BLACK]
+        incremental.occupied = board.occupied
+        incremental.promoted = board.promoted
+
+        incremental.ep_square = board.ep_square
+        incremental.castling_rights = board.castling_rights
+        incremental.turn = board.turn
+        incremental.fullmove_number = board.fullmove_number
+        incremental.halfmove_clock = board.halfmove_clock
+        incremental.move_stack = list(board.move_stack)
+        incremental._stack = list(board._stack)
+
+        incremental.refresh()
+        return incremental
+
+    def refresh(self) -> None:
+        """Recompute all sums from scratch."""
+        material = pst_score = pst_score_eg = material_mg = material_eg = 0
+        zobrist = 0
+        for square, piece in self.piece_map().items():
+            key = (piece.color, piece.piece_type)
+            m, p, mg, eg, p_eg = TERMS[key][square]
+            material += m
+            pst_score += p
+            pst_score_eg += p_eg
+            material_mg += mg
+            material_eg += eg
+            zobrist ^= ZOBRIST_PIECES[key][square]
+
+        self.material = material
+        self.pst_score = pst_score
+        self.pst_score_eg = pst_score_eg
+        self.material_mg = material_mg
+        self.material_eg = material_eg
+        self.zobrist_pieces = zobrist
+
+    def _remove_piece_at(self, square):
+        color = bool(self.occupied_co[chess.WHITE] & chess.BB_SQUARES[square])
+        piece_type = super()._remove_piece_at(square)
+        if piece_type:
+            m, p, mg, eg, p_eg = TERMS[(color, piece_type)][square]
+            self.material -= m
+            self.pst_score -= p
+            self.pst_score_eg -= p_eg
+            self.material_mg -= mg
+            self.material_eg -= eg
+            self.zobrist_pieces ^= ZOBRIST_PIECES[(color, piece_type)][square]
+        return piece_type
+
+    def _set_piece_at(self, square, piece_type, color, promoted=False):
+        super()._set_piece_at(square, piece_type, color, promoted)
+        m, p, mg, eg, p_eg = TERMS[(color, piece_type)][square]
+        self.material += m
+        self.pst_score += p
+        self.pst_score_eg += p_eg
+        self.material_mg += mg
+        self.material_eg += eg
+        self.zobrist_pieces ^= ZOBRIST_PIECES[(color, piece_type)][square]
+
+    def _clear_board(self):
+        super()._clear_board()
+        self.material = 0
+        self.pst_score = 0.0
+        self.pst_score_eg = 0.0
+        self.material_mg = 0
+        self.material_eg = 0
+        self.zobrist_pieces = 0
+
+    def _reset_board(self):
+        super()._reset_board()
+        self.refresh()
+
+    def _set_chess960_pos(self, scharnagl):
+        super()._set_chess960_pos(scharnagl)
+        self.refresh()
+
+    def apply_transform(self, f):
+        super().apply_transform(f)
+        self.refresh()
+
+    def apply_mirror(self):
+        super().apply_mirror()
+        self.refresh()
+
+    def clear_stack(self):
+        super().clear_stack()
+        self._score_stack.clear()
+
+    def zobrist_hash(self) -> int:
+        """Polyglot Zobrist key, using the incrementally kept piece part."""
+        return (
+            self.zobrist_pieces
+            ^ _hasher.hash_castling(self)
+            ^ _hasher.hash_ep_square(self)
+            ^ _hasher.hash_turn(self)
+        )
+
+    def push(self, move):
+        self._score_stack.append(
+            (
+                self.material,
+                self.pst_score,
+                self.pst_score_eg,
+                self.material_mg,
+                self.material_eg,
+                self.zobrist_pieces,
+            )
+        )
+        super().push(move)
+
+    def pop(self):
+        move = super().pop()
+        if self._score_stack:
+            (
+                self.material,
+                self.pst_score,
+                self.pst_score_eg,
+                self.material_mg,
+                self.material_eg,
+                self.zobrist_pieces,
+            ) = self._score_stack.pop()
+        else:
+            # Popping past the position this board was wrapped at
+            self.refresh()
+        return move
+
+    def copy(self, *, stack=True):
+        board = super().copy(stack=stack)
+        board.material = self.material
+        board.pst_score = self.pst_score
+        board.pst_score_eg = self.pst_score_eg
+        board.material_mg = self.material_mg
+        board.material_eg = self.material_eg
+        board.zobrist_pieces = self.zobrist_pieces
+        if stack:
+            depth = len(board.move_stack)
+            board._score_stack = self._score_stack[-depth:] if depth else []
+        return board
+
+
+def zobrist_key(board: chess.Board) -> int:
+    """Polyglot Zobrist key; cheap on an IncrementalBoard."""
+    if isinstance(board, IncrementalBoard):
+        return board.zobrist_hash()
+    return chess.polyglot.zobrist_hash(board)
+
+
+def pst_score(board: chess.Board, endgame: bool = False) -> float:
+    """Material plus piece-square score from White's point of view."""
+    if isinstance(board, IncrementalBoard):
+        return board.pst_score_eg if endgame else board.pst_score
+
+    term = 4 if endgame else 1
+    score = 0
+    for square, piece in board.piece_map().items():
+        score += TERMS[(piece.color, piece.piece_type)][square][term]
+    return score
+
+
+def material_score(board: chess.Board) -> int:
+    """Material balance in pawn units from White's point of view."""
+    if isinstance(board, IncrementalBoard):
+        return board.material
+
+    score = 0
+    for piece_type, value in material_values.items():
+        score += (
+            len(board.pieces(piece_type, chess.WHITE))
+            - len(board.pieces(piece_type, chess.BLACK))
+        ) * value
+    return score
+
+
+def phase_material_score(board: chess.Board, endgame: bool) -> int:
+    """Centipawn material balance with midgame or endgame piece values."""
+    if isinstance(board, IncrementalBoard):
+        return board.material_eg if endgame else board.material_mg
+
+    values = endgame_piece_values if endgame else piece_values
+    score = 0
+    for piece_type, value in values.items():
+        score += (
+            len(board.pieces(piece_type, chess.WHITE))
+            - len(board.pieces(piece_type, chess.BLACK))
+        ) * value
+    return score
@@ -1,142 +1,94 @@
 import chess
 from random import choice
 import math
-from typing import Optional, List, Dict, Tuple
-
-
-"""Piece Square Tables (PSTs)"""
-
-
-piece_score = {"K": 0, "Q": 9, "R": 5, "B": 3, "N": 3, "p": 1}
-
-knight_scores = [
-    [0.0, 0.1, 0.2, 0.2, 0.2, 0.2, 0.1, 0.0],
-    [0.1, 0.3, 0.5, 0.5, 0.5, 0.5, 0.3, 0.1],
-    [0.2, 0.5, 0.6, 0.65, 0.65, 0.6, 0.5, 0.2],
-    [0.2, 0.55, 0.65, 0.7, 0.7, 0.65, 0.55, 0.2],
-    [0.2, 0.5, 0.65, 0.7, 0.7, 0.65, 0.5, 0.2],
-    [0.2, 0.55, 0.6, 0.65, 0.65, 0.6, 0.55, 0.2],
-    [0.1, 0.3, 0.5, 0.55, 0.55, 0.5, 0.3, 0.1],
-    [0.0, 0.1, 0.2, 0.2, 0.2, 0.2, 0.1, 0.0],
-]
-
-bishop_scores = [
-    [0.0, 0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.0],
-    [0.2, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.2],
-    [0.2, 0.4, 0.5, 0.6, 0.6, 0.5, 0.4, 0.2],
-    [0.2, 0.5, 0.5, 0.6, 0.6, 0.5, 0.5, 0.2],
-    [0.2, 0.4, 0.6, 0.6, 0.6, 0.6, 0.4, 0.2],
-    [0.2, 0.6, 0.6, 0.6, 0.6, 0.6, 0.6, 0.2],
-    [0.2, 0.5, 0.4, 0.4, 0.4, 0.4, 0.5, 0.2],
-    [0.0, 0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.0],
-]
-
-rook_scores = [
-    [0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25],
-    [0.5, 0.75, 0.75, 0.75, 0.75, 0.75, 0.75, 0.5],
-    [0.0, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.0],
-    [0.0, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.0],
-    [0.0, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.0],
-    [0.0, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.0],
-    [0.0, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.0],
-    [0.25, 0.25, 0.25, 0.5, 0.5, 0.25, 0.25, 0.25],
-]
-
-queen_scores = [
-    [0.0, 0.2, 0.2, 0.3, 0.3, 0.2, 0.2, 0.0],
-    [0.2, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.2],
-    [0.2, 0.4, 0.5, 0.5, 0.5, 0.5, 0.4, 0.2],
-    [0.3, 0.4, 0.5, 0.5, 0.5, 0.5, 0.4, 0.3],
-    [0.4, 0.4, 0.5, 0.5, 0.5, 0.5, 0.4, 0.3],
-    [0.2, 0.5, 0.5, 0.5, 0.5, 0.5, 0.4, 0.2],
-    [0.2, 0.4, 0.5, 0.4, 0.4, 0.4, 0.4, 0.2],
-    [0.0, 0.2, 0.2, 0.3, 0.3, 0.2, 0.2, 0.0],
-]
-
-pawn_scores = [
-    [0.8, 0.8, 0.8, 0.8, 0.8, 0.8, 0.8, 0.8],
-    [0.7, 0.7, 0.7, 0.7, 0.7, 0.7, 0.7, 0.7],
-    [0.3, 0.3, 0.4, 0.5, 0.5, 0.4, 0.3, 0.3],
-    [0.25, 0.25, 0.3, 0.45, 0.45, 0.3, 0.25, 0.25],
-    [0.2, 0.2, 0.2, 0.4, 0.4, 0.2, 0.2, 0.2],
-    [0.25, 0.15, 0.1, 0.2, 0.2, 0.1, 0.15, 0.25],
-    [0.25, 0.3, 0.3, 0.0, 0.0, 0.3, 0.3, 0.25],
-    [0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.2],
-]
-
-
-
-
-class Node:
+from typing import Optional, List, Dict, Tuple, Iterator
+from EvaluationFunctions.Node import Node as SearchNode
+from EvaluationFunctions.Search import MCTSSearch
+from EvaluationFunctions.GameStatus import game_outcome
+from EvaluationFunctions.Tactics import is_tactical_position, staged_captures
+from EvaluationFunctions.PieceSquareTables import piece_values, endgame_piece_values
+from EvaluationFunctions.IncrementalBoard import (
+    pst_score,
+    phase_material_score,
+)
+from EvaluationFunctions.PawnHash import PawnHashTable, pawn_bitboards
+from EvaluationFunctions.Bitboards import (
+    ADJACENT_FILES,
+    PASSED_SPAN,
+    relative_rank,
+    KING_FILES,
+    PAWN_SHIELD_WIDE,
+    pawn_attacks,
+    piece_targets,
+)
+
+
+class Node(SearchNode):
     def __init__(
         self,
         board: chess.Board,
         parent: Optional["Node"] = None,
         move: Optional[chess.Move] = None,
+        prior: float = 1.0,
     ):
-        self.board = board
-        self.parent = parent
-        self.move = move
-        self.wins = 0
-        self.visits = 0
+        super().__init__(board, parent, move, prior)
         self.children: List[Node] = []
-        self.untried_moves = list(board.legal_moves)
         self.evaluation = 0.5  # Initialize with neutral evaluation
 
-    def expand(self) -> "Node":
+    def expand(self, table: Optional[Dict] = None) -> "Node":
         """Expand node by adding a child node for an untried move."""
         if not self.untried_moves:  # Safety check
             return self
 
-        move = choice(self.untried_moves)  # Randomize move selection
-        self.untried_moves.remove(move)
+        if self.priors is None:
+            # Randomize move selection; with priors the best move goes first
+            index = self.untried_moves.index(choice(self.untried_moves))
+            self.untried_moves.append(self.untried_moves.pop(index))
 
-        new_board = self.board.copy()
-        new_board.push(move)
+        return super().expand(table)
 
-        child_node = Node(new_board, parent=self, move=move)
-        self.children.append(child_node)
-
-        return child_node
-
-    def ucb1(self, exploration: float = math.sqrt(2)) -> float:
+    def ucb1(
+        self,
+        exploration: float = math.sqrt(2),
+        parent_visits: Optional[int] = None,
+    ) -> float:
         """Calculate UCB1 value for node selection."""
         if self.visits == 0:
             return float("inf")
+        if parent_visits is None:
+            parent_visits = self.parent.visits
 
         exploitation = self.wins / self.visits
         exploration_term = exploration * math.sqrt(
-            math.log(self.parent.visits) / self.visits
+            math.log(parent_visits) / self.visits
         )
 
         return exploitation + exploration_term
 
 
-class MCTSEngine:
-    def __init__(self, search_depth=10):
-        self.search_depth = search_depth
+class MCTSEngine(MCTSSearch):
+    node_class = Node
+
+    def __init__(self, search_depth=10, **options):
+        # Search options (selection, ...) are MCTSSearch's
+        super().__init__(search_depth, **options)
         self.iterations = 2000  # Increased iterations for better search
+        self.temperature = 1.0
         self.transposition_table: Dict[str, Tuple[float, int]] = (
             {}
         )  # Cache for positions
-        self.piece_values = {
-            chess.PAWN: 100,
-            chess.KNIGHT: 320,
-            chess.BISHOP: 330,
-            chess.ROOK: 500,
-            chess.QUEEN: 900,
-            chess.KING: 20000,
-        }
-
-        # Endgame piece values
-        self.endgame_piece_values = {
-            chess.PAWN: 150,
-            chess.KNIGHT: 280,
-            chess.BISHOP: 350,
-            chess.ROOK: 525,
-            chess.QUEEN: 1000,
-            chess.KING: 20000,
+        self.delta_margin = 200  # Safety margin for quiescence delta pruning
+        self.quiescence_nodes = 0
+        self.pawn_hash = PawnHashTable()
+        self.mobility_weights = {
+            chess.PAWN: 1,
+            chess.KNIGHT: 2,
+            chess.BISHOP: 2,
+            chess.ROOK: 3,
+            chess.QUEEN: 4,
         }
+        self.piece_values = piece_values
+        self.endgame_piece_values = endgame_piece_values
 
     def get_move(self, board: chess.Board) -> chess.Move:
         """Get the best move for the current position."""
@@ -147,56 +99,47 @@ class MCTSEngine:
         if not legal_moves:
             return None
 
-        root = Node(board)
-        temperature = 1.0
-
-        # Main MCTS loop
-        for iteration in range(self.iterations):
-            # Gradually reduce exploration
-            temperature = max(0.5, temperature * 0.9995)
-
-            # Selection
-            node = root
-            while node.untried_moves == [] and node.children:
-                node = self._select_child(node, temperature)
+        self.temperature = 1.0
+        return super().get_move(board)
 
-            # Expansion
-            if node.untried_moves:
-                node = node.expand()
-                if node is None:  # Safety check
-                    continue
+    def _select(self, node: Node) -> List[Node]:
+        # Gradually reduce exploration
+        self.temperature = max(0.5, self.temperature * 0.9995)
+        return super()._select(node)
 
-            # Simulation and backpropagation
-            if node:  # Additional safety check
-                result = self._simulate_and_evaluate(node.board)
-                self._backpropagate(node, result)
-
-        # Select best move
-        return self._select_best_move(root)
-
-    def _backpropagate(self, node: Node, result: float) -> None:
+    def _backpropagate(self, path: List[Node], result: float) -> None:
         """Backpropagate the result through the tree."""
-        while node is not None:
+        for node in reversed(path):
             node.visits += 1
             node.wins += result
             node.evaluation = node.evaluation * 0.95 + result * 0.05
-            node = node.parent
             result = 1 - result
 
-    def _select_child(self, node: Node, temperature: float) -> Node:
+    def _decision_settled(self, root: Node, remaining: int) -> bool:
+        """Early stop only when the move is picked by visits (PUCT mode)."""
+        # The UCB1-mode move score mixes in an evaluation average, which the
+        # remaining iterations can move in ways that cannot be bounded
+        if self.selection != "puct":
+            return False
+        return super()._decision_settled(root, remaining)
+
+    def _select_child(self, node: Node) -> Node:
         """Select child node with temperature-adjusted UCB1."""
         if not node.children:  # Safety check
             return node
 
-        return max(node.children, key=lambda n: self._ucb1(n, temperature))
+        return max(
+            node.selectable_children(),
+            key=lambda n: self._ucb1(n, self.temperature, node.visits),
+        )
 
-    def _ucb1(self, node: Node, temperature: float) -> float:
+    def _ucb1(self, node: Node, temperature: float, parent_visits: int) -> float:
         """Enhanced UCB1 formula with temperature control."""
         if node.visits == 0:
             return float("inf")
 
-        exploitation = node.wins / node.visits
-        exploration = math.sqrt(2 * math.log(node.parent.visits) / node.visits)
+        exploitation = node.value(self.rave_k)
+        exploration = math.sqrt(2 * math.log(parent_visits) / node.visits)
         position_bonus = node.evaluation * 0.1
 
         return exploitation + temperature * exploration + position_bonus
@@ -205,6 +148,8 @@ class MCTSEngine:
         """Select best move using multiple criteria."""
         if not root.children:  # Safety check
             return choice(list(root.board.legal_moves))
+        if self.selection == "puct":
+            return super()._select_best_move(root)
 
         def move_score(node: Node) -> float:
             if node.visits == 0:
@@ -216,10 +161,14 @@ class MCTSEngine:
 
             return win_rate + visit_weight + eval_bonus
 
-        best_node = max(root.children, key=move_score)
-        return best_node.move
+        best_node = max(root.selectable_children(), key=move_score)
+        return root.move_to(best_node)
 
     def _simulate_and_evaluate(self, board: chess.Board) -> float:
+        """Score for the player who moved into board, from the side to move's."""
+        return 1 - self._evaluate_for_side_to_move(board)
+
+    def _evaluate_for_side_to_move(self, board: chess.Board) -> float:
         """Simulation with quiescence search and evaluation."""
         if board is None:  # Safety check
             return 0.5
@@ -246,29 +195,14 @@ class MCTSEngine:
 
     def _is_tactical_position(self, board: chess.Board) -> bool:
         """Detect if position needs tactical evaluation."""
-        # Check for checks, captures, and immediate threats
-        return (
-            board.is_check()
-            or any(board.is_capture(move) for move in board.legal_moves)
-            or self._has_immediate_threats(board)
-        )
-
-    def _has_immediate_threats(self, board: chess.Board) -> bool:
-        """Check for immediate tactical threats."""
-        for move in board.legal_moves:
-            board.push(move)
-            has_threat = board.is_check() or any(
-                board.is_capture(m) for m in board.legal_moves
-            )
-            board.pop()
-            if has_threat:
-                return True
-        return False
+        # Attack-mask based: checks, winning captures and hanging pieces
+        return is_tactical_position(board)
 
     def _quiescence_search(
         self, board: chess.Board, alpha: float, beta: float, depth: int
     ) -> float:
         """Quiescence search for tactical positions."""
+        self.quiescence_nodes += 1
         stand_pat = self._evaluate_complete(board)
 
         if depth == 0:
@@ -279,7 +213,12 @@ class MCTSEngine:
 
         alpha = max(alpha, stand_pat)
 
-        for move in self._get_capturing_moves(board):
+        # Delta pruning: skip captures that cannot raise alpha even with margin
+        min_gain = None
+        if alpha != float("-inf"):
+            min_gain = alpha - stand_pat - self.delta_margin
+
+        for move in self._get_capturing_moves(board, min_gain):
             board.push(move)
             score = -self._quiescence_search(board, -beta, -alpha, depth - 1)
             board.pop()
@@ -290,19 +229,18 @@ class MCTSEngine:
 
         return alpha
 
-    def _get_capturing_moves(self, board: chess.Board) -> List[chess.Move]:
-        """Get all capturing moves and checks."""
-        return [
-            move
-            for move in board.legal_moves
-            if board.is_capture(move) or board.gives_check(move)
-        ]
+    def _get_capturing_moves(
+        self, board: chess.Board, min_gain: Optional[float] = None
+    ) -> Iterator[chess.Move]:
+        """Yield winning captures, equal captures, then checks (lazily)."""
+        return staged_captures(board, min_gain=min_gain)
 
     def _evaluate_complete(self, board: chess.Board) -> float:
         """Comprehensive position evaluation."""
-        if board.is_game_over():
-            if board.is_checkmate():
-                return -20000 if board.turn else 20000
+        outcome = game_outcome(board)
+        if outcome is not None:
+            if outcome.winner is not None:
+                return -20000  # Side to move is mated
             return 0
 
         score = 0
@@ -337,60 +275,14 @@ class MCTSEngine:
 
     def _evaluate_position(self, board):
         """Enhanced position evaluation using piece-square tables and material count."""
-        score = 0
-        piece_to_table = {
-            chess.KNIGHT: knight_scores,
-            chess.BISHOP: bishop_scores,
-            chess.ROOK: rook_scores,
-            chess.QUEEN: queen_scores,
-            chess.PAWN: pawn_scores,
-        }
-
-        for square in chess.SQUARES:
-            piece = board.piece_at(square)
-            if piece is None:
-                continue
-
-            # Get base piece value
-            piece_value = piece_score.get(piece.symbol().upper(), 0)
-
-            # Get square coordinates (0-7 for both rank and file)
-            rank = chess.square_rank(square)
-            file = chess.square_file(square)
-
-            # For black pieces, we need to flip the rank index
-            position_score = 0
-            if piece.piece_type in piece_to_table:
-                if piece.color == chess.BLACK:
-                    position_score = piece_to_table[piece.piece_type][7 - rank][file]
-                else:
-                    position_score = piece_to_table[piece.piece_type][rank][file]
-
-            # Combine material value with position bonus
-            total_piece_score = piece_value + position_score
-
-            # Add to total score (positive for white, negative for black)
-            if piece.color == chess.WHITE:
-                score += total_piece_score
-            else:
-                score -= total_piece_score
-
-        return score
-
+        # O(1) on an IncrementalBoard, full scan otherwise; endgame tables
+        # once the endgame is reached
+        return pst_score(board, self._is_endgame(board))
 
     def _evaluate_material(self, board: chess.Board) -> float:
         """Evaluate material balance with dynamic piece values."""
-        score = 0
         # Determine game phase
-        is_endgame = self._is_endgame(board)
-        piece_values = self.endgame_piece_values if is_endgame else self.piece_values
-
-        for piece_type in piece_values:
-            score += (
-                len(board.pieces(piece_type, chess.WHITE))
-                - len(board.pieces(piece_type, chess.BLACK))
-            ) * piece_values[piece_type]
-        return score
+        return phase_material_score(board, self._is_endgame(board))
 
     def _is_endgame(self, board: chess.Board) -> bool:
         """Determine if position is in endgame."""
@@ -410,38 +302,39 @@ class MCTSEngine:
 
     def _evaluate_pawn_structure(self, board: chess.Board) -> float:
         """Evaluate pawn structure."""
-        score = 0
+        white_pawns, black_pawns = pawn_bitboards(board)
+
+        score = self.pawn_hash.probe(white_pawns, black_pawns)
+        if score is None:
+            score = self._score_pawns(white_pawns, black_pawns)
+            self.pawn_hash.store(white_pawns, black_pawns, score)
+        return score
 
-        white_pawns = board.pieces(chess.PAWN, chess.WHITE)
-        black_pawns = board.pieces(chess.PAWN, chess.BLACK)
+    def _score_pawns(
+        self, white_pawns: chess.Bitboard, black_pawns: chess.Bitboard
+    ) -> float:
+        """Score doubled, isolated and passed pawns from the pawn bitboards."""
+        score = 0
 
         # Evaluate doubled, isolated, and passed pawns
         for color, pawns in [(chess.WHITE, white_pawns), (chess.BLACK, black_pawns)]:
             multiplier = 1 if color == chess.WHITE else -1
+            opponent_pawns = black_pawns if color == chess.WHITE else white_pawns
 
-            for square in pawns:
+            for square in chess.scan_forward(pawns):
                 file = chess.square_file(square)
-                rank = chess.square_rank(square)
 
                 # Doubled pawns
-                if len([s for s in pawns if chess.square_file(s) == file]) > 1:
+                if chess.popcount(pawns & chess.BB_FILES[file]) > 1:
                     score -= 30 * multiplier
 
                 # Isolated pawns
-                if not any(chess.square_file(s) in [file - 1, file + 1] for s in pawns):
+                if not pawns & ADJACENT_FILES[file]:
                     score -= 20 * multiplier
 
                 # Passed pawns
-                opponent_pawns = black_pawns if color == chess.WHITE else white_pawns
-                if not any(
-                    chess.square_file(s) in [file - 1, file, file + 1]
-                    and (
-                        (color == chess.WHITE and chess.square_rank(s) > rank)
-                        or (color == chess.BLACK and chess.square_rank(s) < rank)
-                    )
-                    for s in opponent_pawns
-                ):
-                    bonus = 50 + (rank if color == chess.WHITE else 7 - rank) * 10
+                if not opponent_pawns & PASSED_SPAN[color][square]:
+                    bonus = 50 + relative_rank(color, square) * 10
                     score += bonus * multiplier
 
         return score
@@ -460,16 +353,13 @@ class MCTSEngine:
             pawn_shield_score = self._evaluate_pawn_shield(board, king_square, color)
 
             # King attackers
-            attackers = len(board.attackers(not color, king_square))
+            attackers = chess.popcount(board.attackers_mask(not color, king_square))
 
             # Open files near king
-            king_file = chess.square_file(king_square)
             open_files = sum(
                 1
-                for f in range(max(0, king_file - 1), min(8, king_file + 2))
-                if not any(
-                    board.piece_at(chess.square(f, r)) == chess.PAWN for r in range(8)
-                )
+                for file_mask in KING_FILES[king_square]
+                if not board.pawns & file_mask
             )
 
             score += (pawn_shield_score - attackers * 20 - open_files * 15) * multiplier
@@ -480,24 +370,9 @@ class MCTSEngine:
         self, board: chess.Board, king_square: chess.Square, color: chess.Color
     ) -> float:
         """Evaluate pawn shield in front of king."""
-        score = 0
-        king_file = chess.square_file(king_square)
-        king_rank = chess.square_rank(king_square)
-
-        # Check pawns in front of king
-        pawn_ranks = range(
-            king_rank + (1 if color == chess.WHITE else -1),
-            king_rank + (3 if color == chess.WHITE else -3),
-            1 if color == chess.WHITE else -1,
-        )
-
-        for f in range(max(0, king_file - 1), min(8, king_file + 2)):
-            for r in pawn_ranks:
-                if 0 <= r < 8:
-                    if board.piece_at(chess.square(f, r)) == chess.PAWN:
-                        score += 10
-
-        return score
+        # Friendly pawns up to two ranks ahead on the king's and adjacent files
+        shield = board.pawns & board.occupied_co[color]
+        return 10 * chess.popcount(shield & PAWN_SHIELD_WIDE[color][king_square])
 
     def _evaluate_mobility(self, board: chess.Board) -> float:
         """Evaluate piece mobility."""
@@ -506,25 +381,13 @@ class MCTSEngine:
             multiplier = 1 if color == chess.WHITE else -1
             mobility = 0
 
-            # Save current turn
-            original_turn = board.turn
-            board.turn = color
-
-            # Count legal moves for each piece
-            for move in board.legal_moves:
-                piece = board.piece_at(move.from_square)
-                if piece is not None:
-                    if piece.piece_type == chess.PAWN:
-                        mobility += 1
-                    elif piece.piece_type in [chess.KNIGHT, chess.BISHOP]:
-                        mobility += 2
-                    elif piece.piece_type == chess.ROOK:
-                        mobility += 3
-                    elif piece.piece_type == chess.QUEEN:
-                        mobility += 4
-
-            # Restore original turn
-            board.turn = original_turn
+            # Pseudo-legal targets, ignoring squares covered by enemy pawns
+            unsafe = pawn_attacks(board, not color)
+            pieces = board.occupied_co[color] & ~board.kings
+            for square in chess.scan_forward(pieces):
+                weight = self.mobility_weights[board.piece_type_at(square)]
+                targets = piece_targets(board, square, color) & ~unsafe
+                mobility += chess.popcount(targets) * weight
 
             score += mobility * multiplier
 
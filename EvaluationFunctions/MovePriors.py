@@ -0,0 +1,50 @@
+import chess
+import math
+from typing import List, Sequence
+from EvaluationFunctions.IncrementalBoard import TERMS
+from EvaluationFunctions.PieceSquareTables import piece_score
+from EvaluationFunctions.Tactics import see
+
+"""Cheap move priors for PUCT selection in the MCTS engines"""
+
+
+CHECK_BONUS = 0.5  # Pawn units
+PRIOR_TEMPERATURE = 1.0  # Pawn units; lower values sharpen the priors
+
+
+def move_score(board: chess.Board, move: chess.Move) -> float:
+    """Rough value of a move in pawn units: exchange gain, check, PST delta."""
+    score = 0.0
+    piece_type = board.piece_type_at(move.from_square)
+    color = board.turn
+    sign = 1 if color == chess.WHITE else -1
+
+    if board.is_capture(move) or move.promotion:
+        score += see(board, move) / 100
+    if board.gives_check(move):
+        score += CHECK_BONUS
+
+    # Piece-square gain of the moving piece (promotion value is in the SEE)
+    table = TERMS[(color, piece_type)]
+    if move.promotion:
+        to_term = TERMS[(color, move.promotion)][move.to_square][1]
+        to_term -= sign * piece_score[chess.piece_symbol(move.promotion).upper()]
+    else:
+        to_term = table[move.to_square][1]
+    score += sign * (to_term - table[move.from_square][1])
+    return score
+
+
+def move_priors(
+    board: chess.Board,
+    moves: Sequence[chess.Move],
+    temperature: float = PRIOR_TEMPERATURE,
+) -> List[float]:
+    """Softmax of the move scores; the priors sum to 1."""
+    if not moves:
+        return []
+    scores = [move_score(board, move) / temperature for move in moves]
+    top = max(scores)
+    weights = [math.exp(score - top) for score in scores]
+    total = sum(weights)
+    return [weight / total for weight in weights]
@@ -1,176 +1,546 @@
 import chess
-from random import choice
+import time
 import math
+import multiprocessing
 
-# Keep the same piece scores and position tables from original code
-piece_score = {"K": 0, "Q": 9, "R": 5, "B": 3, "N": 3, "p": 1}
-
-knight_scores = [
-    [0.0, 0.1, 0.2, 0.2, 0.2, 0.2, 0.1, 0.0],
-    [0.1, 0.3, 0.5, 0.5, 0.5, 0.5, 0.3, 0.1],
-    [0.2, 0.5, 0.6, 0.65, 0.65, 0.6, 0.5, 0.2],
-    [0.2, 0.55, 0.65, 0.7, 0.7, 0.65, 0.55, 0.2],
-    [0.2, 0.5, 0.65, 0.7, 0.7, 0.65, 0.5, 0.2],
-    [0.2, 0.55, 0.6, 0.65, 0.65, 0.6, 0.55, 0.2],
-    [0.1, 0.3, 0.5, 0.55, 0.55, 0.5, 0.3, 0.1],
-    [0.0, 0.1, 0.2, 0.2, 0.2, 0.2, 0.1, 0.0],
-]
-
-bishop_scores = [
-    [0.0, 0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.0],
-    [0.2, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.2],
-    [0.2, 0.4, 0.5, 0.6, 0.6, 0.5, 0.4, 0.2],
-    [0.2, 0.5, 0.5, 0.6, 0.6, 0.5, 0.5, 0.2],
-    [0.2, 0.4, 0.6, 0.6, 0.6, 0.6, 0.4, 0.2],
-    [0.2, 0.6, 0.6, 0.6, 0.6, 0.6, 0.6, 0.2],
-    [0.2, 0.5, 0.4, 0.4, 0.4, 0.4, 0.5, 0.2],
-    [0.0, 0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.0],
-]
-
-rook_scores = [
-    [0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25],
-    [0.5, 0.75, 0.75, 0.75, 0.75, 0.75, 0.75, 0.5],
-    [0.0, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.0],
-    [0.0, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.0],
-    [0.0, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.0],
-    [0.0, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.0],
-    [0.0, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.0],
-    [0.25, 0.25, 0.25, 0.5, 0.5, 0.25, 0.25, 0.25],
-]
-
-queen_scores = [
-    [0.0, 0.2, 0.2, 0.3, 0.3, 0.2, 0.2, 0.0],
-    [0.2, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.2],
-    [0.2, 0.4, 0.5, 0.5, 0.5, 0.5, 0.4, 0.2],
-    [0.3, 0.4, 0.5, 0.5, 0.5, 0.5, 0.4, 0.3],
-    [0.4, 0.4, 0.5, 0.5, 0.5, 0.5, 0.4, 0.3],
-    [0.2, 0.5, 0.5, 0.5, 0.5, 0.5, 0.4, 0.2],
-    [0.2, 0.4, 0.5, 0.4, 0.4, 0.4, 0.4, 0.2],
-    [0.0, 0.2, 0.2, 0.3, 0.3, 0.2, 0.2, 0.0],
-]
-
-pawn_scores = [
-    [0.8, 0.8, 0.8, 0.8, 0.8, 0.8, 0.8, 0.8],
-    [0.7, 0.7, 0.7, 0.7, 0.7, 0.7, 0.7, 0.7],
-    [0.3, 0.3, 0.4, 0.5, 0.5, 0.4, 0.3, 0.3],
-    [0.25, 0.25, 0.3, 0.45, 0.45, 0.3, 0.25, 0.25],
-    [0.2, 0.2, 0.2, 0.4, 0.4, 0.2, 0.2, 0.2],
-    [0.25, 0.15, 0.1, 0.2, 0.2, 0.1, 0.15, 0.25],
-    [0.25, 0.3, 0.3, 0.0, 0.0, 0.3, 0.3, 0.25],
-    [0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.2],
-]
+from EvaluationFunctions.IncrementalBoard import (
+    IncrementalBoard,
+    pst_score,
+    zobrist_key,
+)
+from EvaluationFunctions.Negmax.TranspositionTable import (
+    TranspositionTable,
+    SharedTranspositionTable,
+    EXACT,
+    LOWER,
+    UPPER,
+)
+from EvaluationFunctions.Tactics import mvv_lva, staged_captures
+from EvaluationFunctions.GameStatus import game_outcome
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the move deadline has passed."""
 
 
 class ImprovedChessEngine:
-    def __init__(self, depth=3):
+    def __init__(
+        self,
+        depth=3,
+        time_limit=None,
+        max_depth=64,
+        use_tt=True,
+        tt_size=1 << 18,
+        use_pvs=True,
+        use_null_move=True,
+        use_lmr=True,
+        use_quiescence=True,
+        use_aspiration=True,
+        aspiration_window=0.25,
+        threads=1,
+    ):
+        # Constructor arguments, handed to Lazy SMP helper processes
+        self.config = {
+            "depth": depth,
+            "time_limit": time_limit,
+            "max_depth": max_depth,
+            "use_tt": use_tt,
+            "tt_size": tt_size,
+            "use_pvs": use_pvs,
+            "use_null_move": use_null_move,
+            "use_lmr": use_lmr,
+            "use_quiescence": use_quiescence,
+            "use_aspiration": use_aspiration,
+            "aspiration_window": aspiration_window,
+        }
+
         self.DEPTH = depth
         self.CHECKMATE = 1000
         self.STALEMATE = 0
         self.next_move = None
-        
+
+        # Iterative deepening: fixed depth unless a per-move time limit is set
+        self.time_limit = time_limit
+        self.max_depth = max_depth
+        self.deadline = None
+        self.pv = []  # Principal variation of the last completed iteration
+        self.completed_depth = 0
+        self.nodes = 0
+
+        # Move ordering heuristics
+        self.killers = [[None, None] for _ in range(max_depth + 1)]
+        self.history = [[[0] * 64 for _ in range(64)] for _ in chess.COLORS]
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.null_move_cutoffs = 0
+
+        # Transposition table, kept between moves
+        self.use_tt = use_tt
+        self.tt = TranspositionTable(tt_size)
+
+        # Selectivity, each switchable for benchmarking
+        self.use_pvs = use_pvs
+        self.use_null_move = use_null_move
+        self.use_lmr = use_lmr
+        self.NULL_WINDOW = 0.001  # Width of a zero window in score units
+        self.NULL_MOVE_REDUCTION = 2
+        self.LMR_MIN_DEPTH = 3
+        self.LMR_MIN_MOVES = 3  # Moves searched at full depth before reducing
+
+        # Capture-only search at the horizon
+        self.use_quiescence = use_quiescence
+        self.DELTA_MARGIN = 2  # Pawn units a capture may gain beyond SEE
+
+        # Aspiration windows: search each iteration around the previous score
+        self.use_aspiration = use_aspiration
+        self.aspiration_window = aspiration_window  # Half-width in pawn units
+        self.root_score = None
+        self.fail_highs = 0
+        self.fail_lows = 0
+
+        # Lazy SMP: helper processes share the TT through shared memory
+        self.threads = threads
+        self.shared_tt = None
+        self.stop_event = None
+        self.helper_depths = []  # Deepest completed depth of each helper
+
     def get_move(self, board):
         """Main method to get the best move using negamax with alpha-beta pruning"""
+        # Searching on an IncrementalBoard makes leaf evaluation O(1)
+        board = IncrementalBoard.from_board(board)
         valid_moves = list(board.legal_moves)
-        self.find_best_move_negamax(board, valid_moves)
-        return self.next_move
-        
-    def find_best_move_negamax(self, board, valid_moves):
+        if not valid_moves:
+            return None
+
+        self.start_time = time.time()
+        self.deadline = self.start_time + self.time_limit if self.time_limit else None
+
+        self.pv = []
+        self.nodes = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.null_move_cutoffs = 0
+        self.completed_depth = 0
+        self.root_score = None
+        self.fail_highs = 0
+        self.fail_lows = 0
+        self._reset_ordering()
+
+        if self.threads > 1:
+            best_move = self._lazy_smp(board, valid_moves)
+        else:
+            self.tt.new_search()
+            best_move = self._iterative_deepening(board, valid_moves)
+
+        self.next_move = best_move
+        return best_move
+
+    def _iterative_deepening(self, board, valid_moves, first_depth=1, report=None):
+        """Deepen until max depth or deadline; return the last completed best move."""
+        max_depth = self.max_depth if self.time_limit else self.DEPTH
+        best_move = valid_moves[0]
+
+        for depth in range(first_depth, max_depth + 1):
+            try:
+                self.find_best_move_negamax(board, valid_moves, depth)
+            except SearchTimeout:
+                # Keep the result of the last completed iteration
+                break
+
+            best_move = self.next_move or best_move
+            self.completed_depth = depth
+            if report is not None:
+                report(depth, best_move)
+
+            # Stop early if the next, deeper iteration cannot finish in time
+            if self.deadline is not None:
+                elapsed = time.time() - self.start_time
+                if self.start_time + elapsed * 2 > self.deadline:
+                    break
+
+        return best_move
+
+    def _lazy_smp(self, board, valid_moves):
+        """Search with helper processes sharing one TT; keep the deepest result."""
+        if self.shared_tt is None:
+            self.shared_tt = SharedTranspositionTable(self.tt.size)
+        self.tt = self.shared_tt
+        self.tt.new_search()
+
+        helpers = self.threads - 1
+        self.stop_event = multiprocessing.Event()
+        # Per helper: deepest completed depth and its best move (encoded)
+        results = multiprocessing.Array("q", 2 * helpers, lock=False)
+
+        processes = []
+        for index in range(helpers):
+            process = multiprocessing.Process(
+                target=_lazy_smp_worker,
+                args=(
+                    board.fen(),
+                    self.config,
+                    self.tt.name,
+                    self.tt.generation,
+                    # Stagger helpers so they do not all search the same depth
+                    1 + (index + 1) % 2,
+                    self.start_time,
+                    self.deadline,
+                    self.stop_event,
+                    results,
+                    index,
+                ),
+                daemon=True,
+            )
+            process.start()
+            processes.append(process)
+
+        best_move = self._iterative_deepening(board, valid_moves)
+        best_depth = self.completed_depth
+
+        self.stop_event.set()
+        for process in processes:
+            process.join(timeout=1.0)
+            if process.is_alive():
+                process.terminate()
+        self.stop_event = None
+
+        self.helper_depths = []
+        for index in range(helpers):
+            depth, move_bits = results[2 * index], results[2 * index + 1]
+            self.helper_depths.append(depth)
+            move = SharedTranspositionTable._decode_move(move_bits)
+            if depth > best_depth and move in valid_moves:
+                best_depth, best_move = depth, move
+
+        self.completed_depth = best_depth
+        return best_move
+
+    def close(self):
+        """Release the shared-memory transposition table, if any."""
+        if self.shared_tt is not None:
+            self.shared_tt.close()
+            self.shared_tt = None
+
+    def find_best_move_negamax(self, board, valid_moves, depth=None):
         """Find the best move using negamax algorithm with alpha-beta pruning"""
         self.next_move = None
-        # Randomize move order for better alpha-beta pruning
-        valid_moves = list(valid_moves)
-        choice(valid_moves)
-        
-        self.find_move_negamax_alpha_beta(
-            board, valid_moves, self.DEPTH, 
-            -self.CHECKMATE, self.CHECKMATE,
-            1 if board.turn else -1
-        )
-        
+        self.root_depth = depth or self.DEPTH
+        self.pv_table = [[] for _ in range(self.root_depth + 1)]
+
+        stack_size = len(board.move_stack)
+        try:
+            score = self._search_root(board, valid_moves, self.root_depth)
+        except SearchTimeout:
+            # Unwind the moves pushed by the aborted iteration
+            while len(board.move_stack) > stack_size:
+                board.pop()
+            raise
+
+        self.root_score = score
+        self.pv = self.pv_table[0]
         return self.next_move
 
-    def find_move_negamax_alpha_beta(self, board, valid_moves, depth, alpha, beta, turn_multiplier):
+    def _search_root(self, board, valid_moves, depth):
+        """Search the root inside an aspiration window around the last score.
+
+        A fail low or fail high widens that side of the window (doubling the
+        step each time) and searches again, until the score lands inside.
+        """
+        turn_multiplier = 1 if board.turn else -1
+        previous = self.root_score
+        if (
+            not self.use_aspiration
+            or previous is None
+            or abs(previous) >= self.CHECKMATE / 2  # Mate scores do not settle
+        ):
+            return self.find_move_negamax_alpha_beta(
+                board, valid_moves, depth,
+                -self.CHECKMATE, self.CHECKMATE, turn_multiplier
+            )
+
+        step = self.aspiration_window
+        alpha = max(previous - step, -self.CHECKMATE)
+        beta = min(previous + step, self.CHECKMATE)
+        while True:
+            best_move = self.next_move
+            score = self.find_move_negamax_alpha_beta(
+                board, valid_moves, depth, alpha, beta, turn_multiplier
+            )
+            if score <= alpha and alpha > -self.CHECKMATE:
+                # Fail low: every root move is an upper bound, keep the old one
+                self.fail_lows += 1
+                self.next_move = best_move
+                step *= 2
+                alpha = max(score - step, -self.CHECKMATE)
+            elif score >= beta and beta < self.CHECKMATE:
+                self.fail_highs += 1
+                step *= 2
+                beta = min(score + step, self.CHECKMATE)
+            else:
+                return score
+
+    def _reset_ordering(self):
+        """Clear killer moves and age the history table between searches."""
+        self.killers = [[None, None] for _ in range(self.max_depth + 1)]
+        for side in self.history:
+            for row in side:
+                for to_square in range(64):
+                    row[to_square] //= 8
+
+    def _order_moves(self, board, moves, ply, hash_move=None):
+        """Order moves: hash/PV move, captures by MVV-LVA, killers, history."""
+        pv_move = self.pv[ply] if ply < len(self.pv) else None
+        killers = self.killers[ply] if ply < len(self.killers) else (None, None)
+        history = self.history[board.turn]
+
+        def score(move):
+            if move == hash_move:
+                return 3_000_000
+            if move == pv_move:
+                return 2_000_000
+            if move.promotion or board.is_capture(move):
+                return 1_000_000 + mvv_lva(board, move)
+            if move == killers[0]:
+                return 900_000
+            if move == killers[1]:
+                return 800_000
+            return history[move.from_square][move.to_square]
+
+        return sorted(moves, key=score, reverse=True)
+
+    def _record_cutoff(self, board, move, depth, ply, move_index):
+        """Update killers and history after a beta cutoff."""
+        self.cutoffs += 1
+        if move_index == 0:
+            self.first_move_cutoffs += 1
+
+        if board.is_capture(move) or move.promotion:
+            return
+        if ply < len(self.killers) and self.killers[ply][0] != move:
+            self.killers[ply][1] = self.killers[ply][0]
+            self.killers[ply][0] = move
+        self.history[board.turn][move.from_square][move.to_square] += depth * depth
+
+    def search_stats(self):
+        """Node count and cutoff statistics of the last search."""
+        return {
+            "depth": self.completed_depth,
+            "nodes": self.nodes,
+            "cutoffs": self.cutoffs,
+            "first_move_cutoff_rate": (
+                self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+            ),
+            "null_move_cutoffs": self.null_move_cutoffs,
+            "tt_hit_rate": self.tt.hits / self.tt.probes if self.tt.probes else 0.0,
+            "fail_highs": self.fail_highs,
+            "fail_lows": self.fail_lows,
+            "researches": self.fail_highs + self.fail_lows,
+            "helper_depths": list(self.helper_depths),
+        }
+
+    def _check_time(self):
+        """Abort the running iteration once the deadline has passed."""
+        self.nodes += 1
+        if self.nodes & 255 == 0:
+            if self.deadline is not None and time.time() > self.deadline:
+                raise SearchTimeout()
+            if self.stop_event is not None and self.stop_event.is_set():
+                raise SearchTimeout()
+
+    def _has_non_pawn_material(self, board):
+        """Side to move has a piece besides king and pawns (zugzwang guard)."""
+        return bool(board.occupied_co[board.turn] & ~(board.pawns | board.kings))
+
+    def find_move_negamax_alpha_beta(
+        self,
+        board,
+        valid_moves,
+        depth,
+        alpha,
+        beta,
+        turn_multiplier,
+        ply=0,
+        allow_null=True,
+    ):
         """Negamax implementation with alpha-beta pruning"""
-        if depth == 0:
+        self._check_time()
+        self.pv_table[ply] = []
+        if depth <= 0:
+            if self.use_quiescence:
+                return self.quiescence(board, alpha, beta, turn_multiplier)
             return turn_multiplier * self.evaluate_position(board)
 
-        max_score = -self.CHECKMATE
-        for move in valid_moves:
-            board.push(move)
-            next_moves = list(board.legal_moves)
+        # Transposition table: cut off on a deep enough bound, else order by it
+        alpha_orig = alpha
+        key = zobrist_key(board) if self.use_tt else None
+        entry = self.tt.probe(key) if self.use_tt else None
+        hash_move = None
+        if entry is not None:
+            hash_move = entry.move
+            if ply > 0 and entry.depth >= depth:
+                if entry.bound == EXACT:
+                    return entry.score
+                if entry.bound == LOWER:
+                    alpha = max(alpha, entry.score)
+                elif entry.bound == UPPER:
+                    beta = min(beta, entry.score)
+                if alpha >= beta:
+                    return entry.score
+
+        in_check = board.is_check()
+        # Zero windows come out a rounding error wider than NULL_WINDOW
+        is_pv = beta - alpha > 2 * self.NULL_WINDOW
+
+        # Null-move pruning: if passing still fails high, this node will too
+        if (
+            self.use_null_move
+            and allow_null
+            and not is_pv
+            and not in_check
+            and depth > self.NULL_MOVE_REDUCTION
+            and self._has_non_pawn_material(board)
+        ):
+            board.push(chess.Move.null())
             score = -self.find_move_negamax_alpha_beta(
-                board, next_moves, depth - 1,
-                -beta, -alpha, -turn_multiplier
+                board, None, depth - 1 - self.NULL_MOVE_REDUCTION,
+                -beta, -beta + self.NULL_WINDOW, -turn_multiplier, ply + 1,
+                allow_null=False,
             )
             board.pop()
+            if score >= beta:
+                self.null_move_cutoffs += 1
+                # Fail soft, but never trust a mate found by passing
+                return score if score < self.CHECKMATE / 2 else beta
+
+        if valid_moves is None:
+            valid_moves = list(board.legal_moves)
+        if not valid_moves:
+            return -self.CHECKMATE if in_check else self.STALEMATE
+        valid_moves = self._order_moves(board, valid_moves, ply, hash_move)
+        killers = self.killers[ply] if ply < len(self.killers) else (None, None)
+
+        max_score = -self.CHECKMATE
+        best_move = None
+        for move_index, move in enumerate(valid_moves):
+            quiet = not (move.promotion or board.is_capture(move))
+            board.push(move)
+
+            # Late-move reduction for quiet moves ordered late
+            reduction = 0
+            if (
+                self.use_lmr
+                and quiet
+                and depth >= self.LMR_MIN_DEPTH
+                and move_index >= self.LMR_MIN_MOVES
+                and not in_check
+                and move not in killers
+                and not board.is_check()
+            ):
+                reduction = 1 if move_index < 2 * self.LMR_MIN_MOVES else 2
+
+            if move_index == 0:
+                score = -self.find_move_negamax_alpha_beta(
+                    board, None, depth - 1,
+                    -beta, -alpha, -turn_multiplier, ply + 1
+                )
+            elif self.use_pvs:
+                # Principal variation search: prove the move is no better
+                score = -self.find_move_negamax_alpha_beta(
+                    board, None, depth - 1 - reduction,
+                    -alpha - self.NULL_WINDOW, -alpha, -turn_multiplier, ply + 1
+                )
+                if score > alpha and reduction:
+                    score = -self.find_move_negamax_alpha_beta(
+                        board, None, depth - 1,
+                        -alpha - self.NULL_WINDOW, -alpha, -turn_multiplier, ply + 1
+                    )
+                if alpha < score < beta:
+                    score = -self.find_move_negamax_alpha_beta(
+                        board, None, depth - 1,
+                        -beta, -alpha, -turn_multiplier, ply + 1
+                    )
+            else:
+                score = -self.find_move_negamax_alpha_beta(
+                    board, None, depth - 1 - reduction,
+                    -beta, -alpha, -turn_multiplier, ply + 1
+                )
+                # A reduced move that beats alpha is searched again in full
+                if score > alpha and reduction:
+                    score = -self.find_move_negamax_alpha_beta(
+                        board, None, depth - 1,
+                        -beta, -alpha, -turn_multiplier, ply + 1
+                    )
+            board.pop()
 
             if score > max_score:
                 max_score = score
-                if depth == self.DEPTH:
+                best_move = move
+                self.pv_table[ply] = [move] + self.pv_table[ply + 1]
+                if ply == 0:
                     self.next_move = move
 
             if max_score > alpha:
                 alpha = max_score
             if alpha >= beta:
+                self._record_cutoff(board, move, depth, ply, move_index)
                 break
 
+        if self.use_tt:
+            if max_score <= alpha_orig:
+                bound = UPPER
+            elif max_score >= beta:
+                bound = LOWER
+            else:
+                bound = EXACT
+            self.tt.store(key, depth, max_score, bound, best_move)
+
         return max_score
 
-    def evaluate_position(self, board):
-        """Evaluate the board position"""
-        if board.is_checkmate():
-            if board.turn:  # White to move
+    def quiescence(self, board, alpha, beta, turn_multiplier):
+        """Capture-only search with stand-pat and delta pruning."""
+        self._check_time()
+
+        if board.is_check():
+            # No standing pat in check: every evasion has to be looked at
+            moves = list(board.legal_moves)
+            if not moves:
                 return -self.CHECKMATE
-            else:
-                return self.CHECKMATE
-        elif board.is_stalemate():
-            return self.STALEMATE
+            max_score = -self.CHECKMATE
+        else:
+            stand_pat = turn_multiplier * pst_score(board)
+            if stand_pat >= beta:
+                return stand_pat
+            alpha = max(alpha, stand_pat)
+            max_score = stand_pat
 
-        score = 0
-        
-        # Evaluate each piece on the board
-        for square in chess.SQUARES:
-            piece = board.piece_at(square)
-            if piece is None:
-                continue
+            # Delta pruning: skip captures whose SEE gain cannot reach alpha
+            min_gain = (alpha - stand_pat - self.DELTA_MARGIN) * 100
+            moves = staged_captures(board, min_gain=min_gain, include_checks=False)
 
-            piece_value = piece_score.get(piece.symbol().upper(), 0)
-            
-            # Get position score based on piece type and color
-            position_score = 0
-            rank = chess.square_rank(square)
-            file = chess.square_file(square)
-            
-            # Map piece types to their position score tables
-            if piece.piece_type == chess.PAWN:
-                position_table = pawn_scores
-            elif piece.piece_type == chess.KNIGHT:
-                position_table = knight_scores
-            elif piece.piece_type == chess.BISHOP:
-                position_table = bishop_scores
-            elif piece.piece_type == chess.ROOK:
-                position_table = rook_scores
-            elif piece.piece_type == chess.QUEEN:
-                position_table = queen_scores
-            else:  # King
-                continue  # Skip position scoring for king
-                
-            # Flip board for black pieces
-            if piece.color == chess.BLACK:
-                position_score = position_table[7 - rank][file]
-            else:
-                position_score = position_table[rank][file]
+        for move in moves:
+            board.push(move)
+            score = -self.quiescence(board, -beta, -alpha, -turn_multiplier)
+            board.pop()
 
-            # Calculate final piece score
-            piece_final_score = piece_value + position_score
-            
-            # Add to total score (positive for white, negative for black)
-            if piece.color == chess.WHITE:
-                score += piece_final_score
-            else:
-                score -= piece_final_score
+            if score > max_score:
+                max_score = score
+            if max_score > alpha:
+                alpha = max_score
+            if alpha >= beta:
+                break
 
-        return score
+        return max_score
+
+    def evaluate_position(self, board):
+        """Evaluate the board position"""
+        outcome = game_outcome(board)
+        if outcome is not None:
+            if outcome.winner is None:
+                return self.STALEMATE  # Any draw
+            return self.CHECKMATE if outcome.winner else -self.CHECKMATE
+
+        # Material plus piece-square bonus, O(1) on an IncrementalBoard
+        return pst_score(board)
 
     def _additional_positional_factors(self, board):
         """Calculate additional positional factors"""
@@ -219,4 +589,37 @@ class ImprovedChessEngine:
             if black_pawns == 1:  # Isolated black pawn
                 score += 0.2
 
-        return score
\ No newline at end of file
+        return score
+
+
+def _lazy_smp_worker(
+    fen,
+    config,
+    tt_name,
+    generation,
+    first_depth,
+    start_time,
+    deadline,
+    stop_event,
+    results,
+    index,
+):
+    """Lazy SMP helper: search the root, sharing the TT, until told to stop."""
+    engine = ImprovedChessEngine(**config)
+    engine.tt = SharedTranspositionTable(config["tt_size"], name=tt_name)
+    engine.tt.generation = generation
+    engine.start_time = start_time
+    engine.deadline = deadline
+    engine.stop_event = stop_event
+
+    board = IncrementalBoard(fen)
+    valid_moves = list(board.legal_moves)
+
+    def report(depth, move):
+        results[2 * index] = depth
+        results[2 * index + 1] = SharedTranspositionTable._encode_move(move)
+
+    try:
+        engine._iterative_deepening(board, valid_moves, first_depth, report)
+    finally:
+        engine.tt.close()
@@ -0,0 +1,208 @@
+import chess
+import struct
+from multiprocessing import shared_memory
+from typing import NamedTuple, Optional
+
+# Bound types of a stored score
+EXACT = 0
+LOWER = 1  # Score is at least this (fail high)
+UPPER = 2  # Score is at most this (fail low)
+
+
+class TTEntry(NamedTuple):
+    key: int
+    depth: int
+    score: float
+    bound: int
+    move: Optional[chess.Move]
+    generation: int
+
+
+class TranspositionTable:
+    """Fixed-size, Zobrist-indexed transposition table.
+
+    One entry per slot. A new entry replaces the old one if it is for the
+    same position, comes from a newer search, or was searched at least as
+    deep (depth-preferred replacement).
+    """
+
+    def __init__(self, size: int = 1 << 18):
+        self.size = size
+        self.entries = [None] * size
+        self.generation = 0
+        self.hits = 0
+        self.probes = 0
+
+    def new_search(self) -> None:
+        """Age existing entries so they can be replaced by the next search."""
+        self.generation += 1
+        self.hits = 0
+        self.probes = 0
+
+    def probe(self, key: int) -> Optional[TTEntry]:
+        """Return the entry for this Zobrist key, or None."""
+        self.probes += 1
+        entry = self.entries[key % self.size]
+        if entry is not None and entry.key == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def store(
+        self,
+        key: int,
+        depth: int,
+        score: float,
+        bound: int,
+        move: Optional[chess.Move],
+    ) -> None:
+        """Store a search result using depth-preferred replacement."""
+        index = key % self.size
+        old = self.entries[index]
+        if (
+            old is None
+            or old.key == key
+            or old.generation != self.generation
+            or depth >= old.depth
+        ):
+            if move is None and old is not None and old.key == key:
+                move = old.move  # Keep the best move we already knew
+            self.entries[index] = TTEntry(
+                key, depth, score, bound, move, self.generation
+            )
+
+    def clear(self) -> None:
+        self.entries = [None] * self.size
+        self.generation = 0
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing block; only the creating process unlinks it."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13: helpers share the creator's resource tracker, which
+        # already knows the block, so re-registering it is harmless
+        return shared_memory.SharedMemory(name=name)
+
+
+class SharedTranspositionTable:
+    """Lockless transposition table in shared memory for Lazy SMP.
+
+    Each slot is two 64-bit words: ``key ^ data`` and ``data``. A reader
+    accepts the slot only if the XOR of the two words gives its key back,
+    so a slot torn by two processes writing at once just reads as a miss.
+    ``data`` packs score (24 bits, 1/1000 units), depth (8), bound (2),
+    generation (8) and move (16).
+    """
+
+    SCORE_SCALE = 1000
+    SCORE_BIAS = 1 << 23
+    SLOT = struct.Struct("<QQ")
+
+    def __init__(self, size: int = 1 << 18, name: Optional[str] = None):
+        self.size = size
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=size * 16)
+            self.shm.buf[:] = bytes(size * 16)
+        else:
+            self.shm = _attach_shared_memory(name)
+        self.name = self.shm.name
+        self.generation = 0
+        self.hits = 0
+        self.probes = 0
+
+    def new_search(self) -> None:
+        self.generation = (self.generation + 1) & 0xFF
+        self.hits = 0
+        self.probes = 0
+
+    @staticmethod
+    def _encode_move(move: Optional[chess.Move]) -> int:
+        if not move:
+            return 0
+        return (
+            0x8000
+            | move.from_square
+            | (move.to_square << 6)
+            | ((move.promotion or 0) << 12)
+        )
+
+    @staticmethod
+    def _decode_move(bits: int) -> Optional[chess.Move]:
+        if not bits & 0x8000:
+            return None
+        promotion = (bits >> 12) & 0x7
+        return chess.Move(bits & 0x3F, (bits >> 6) & 0x3F, promotion or None)
+
+    def _pack(self, depth, score, bound, move) -> int:
+        score_bits = int(round(score * self.SCORE_SCALE)) + self.SCORE_BIAS
+        score_bits = min(max(score_bits, 0), (1 << 24) - 1)
+        return (
+            score_bits
+            | (min(depth, 0xFF) << 24)
+            | (bound << 32)
+            | (self.generation << 34)
+            | (self._encode_move(move) << 42)
+        )
+
+    def _unpack(self, key: int, data: int) -> TTEntry:
+        score = ((data & 0xFFFFFF) - self.SCORE_BIAS) / self.SCORE_SCALE
+        return TTEntry(
+            key,
+            (data >> 24) & 0xFF,
+            score,
+            (data >> 32) & 0x3,
+            self._decode_move((data >> 42) & 0xFFFF),
+            (data >> 34) & 0xFF,
+        )
+
+    def probe(self, key: int) -> Optional[TTEntry]:
+        """Return the entry for this Zobrist key, or None."""
+        self.probes += 1
+        offset = self.SLOT.size * (key % self.size)
+        check, data = self.SLOT.unpack_from(self.shm.buf, offset)
+        if data and check ^ data == key:
+            self.hits += 1
+            return self._unpack(key, data)
+        return None
+
+    def store(
+        self,
+        key: int,
+        depth: int,
+        score: float,
+        bound: int,
+        move: Optional[chess.Move],
+    ) -> None:
+        """Store a search result using depth-preferred replacement."""
+        offset = self.SLOT.size * (key % self.size)
+        check, data = self.SLOT.unpack_from(self.shm.buf, offset)
+        if data:
+            same = check ^ data == key
+            old = self._unpack(key, data)
+            current = old.generation == self.generation
+            if not same and current and depth < old.depth:
+                return
+            if same and move is None:
+                move = old.move
+
+        data = self._pack(depth, score, bound, move)
+        self.SLOT.pack_into(self.shm.buf, offset, key ^ data, data)
+
+    def clear(self) -> None:
+        self.shm.buf[:] = bytes(self.size * 16)
+        self.generation = 0
+
+    def close(self) -> None:
+        """Detach from the block, and free it if this process created it."""
+        if self.shm is None:
+            return
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+        self.shm = None
+
+    def __del__(self):
+        self.close()
@@ -1,33 +1,180 @@
 import math
 import chess
+from EvaluationFunctions.MovePriors import move_priors
+from EvaluationFunctions.IncrementalBoard import zobrist_key
+from EvaluationFunctions.GameStatus import game_outcome
+
+# Proven game values, from the point of view of the player who made the
+# node's move (MCTS-solver)
+WIN = 1.0
+DRAW = 0.5
+LOSS = 0.0
 
 
 class Node:
-    def __init__(self, board=chess.Board, parent=None, move=None):
+    def __init__(self, board=chess.Board, parent=None, move=None, prior=1.0):
         self.board = board
         self.parent = parent
         self.move = move  # Move that led to this node
         self.children = []
+        # Move to each child; in a DAG a shared child has several parents,
+        # and its own parent and move are those of the first one
+        self.edge_moves = {}
         self.wins = 0
         self.visits = 0
         self.untried_moves = list(board.legal_moves)
+        self.prior = prior  # Parent's prior probability for self.move
+        self.priors = None  # Priors of untried_moves, once scored
+        # All-moves-as-first statistics for self.move (RAVE)
+        self.amaf_wins = 0
+        self.amaf_visits = 0
+        self.proven = self._terminal_value()
+
+    def _terminal_value(self):
+        """WIN, DRAW or LOSS if the game is over here, else None."""
+        outcome = game_outcome(self.board, self.untried_moves)
+        if outcome is None:
+            return None
+        # Only the player who moved into the node can have won
+        return WIN if outcome.winner is not None else DRAW
+
+    def solve(self):
+        """Proven value of this node from its children, or None.
+
+        One winning reply proves a loss for this node's mover; otherwise
+        every move must be expanded and proven, and the side to move takes
+        the best of them.
+        """
+        if any(child.proven == WIN for child in self.children):
+            return LOSS
+        if self.untried_moves:
+            return None
+        if any(child.proven is None for child in self.children):
+            return None
+        return 1 - max(child.proven for child in self.children)
+
+    def selectable_children(self):
+        """Children not proven lost for the side to move (all, if none is left)."""
+        children = [child for child in self.children if child.proven != LOSS]
+        return children or self.children
+
+    def value(self, rave_k=None):
+        """Win rate, blended with the AMAF win rate when RAVE is on.
 
-    def ucb1(self, c=1.41):
+        The AMAF weight ``sqrt(rave_k / (3 * visits + rave_k))`` fades as
+        the node collects visits of its own.
+        """
+        win_rate = self.wins / self.visits
+        if rave_k is None or not self.amaf_visits:
+            return win_rate
+        beta = math.sqrt(rave_k / (3 * self.visits + rave_k))
+        return (1 - beta) * win_rate + beta * self.amaf_wins / self.amaf_visits
+
+    def ucb1(self, c=1.41, rave_k=None, parent_visits=None):
         if self.visits == 0:
             return float("inf")
-        return (self.wins / self.visits) + c * math.sqrt(
-            math.log(self.parent.visits) / self.visits
+        if parent_visits is None:
+            parent_visits = self.parent.visits
+        return self.value(rave_k) + c * math.sqrt(
+            math.log(parent_visits) / self.visits
         )
 
+    def puct(self, c=1.5, rave_k=None, parent_visits=None):
+        """PUCT score: win rate plus a prior-weighted exploration bonus."""
+        if parent_visits is None:
+            parent_visits = self.parent.visits
+        return self.value(rave_k) + c * self.prior * math.sqrt(
+            parent_visits
+        ) / (1 + self.visits)
+
+    def move_to(self, child):
+        """The move from this node to one of its children."""
+        return self.edge_moves[child]
+
+    def score_moves(self):
+        """Compute priors for the untried moves, keeping the best one last."""
+        if self.priors is not None:
+            return
+        priors = move_priors(self.board, self.untried_moves)
+        ranked = sorted(zip(priors, range(len(priors))))
+        self.untried_moves = [self.untried_moves[i] for _, i in ranked]
+        self.priors = [prior for prior, _ in ranked]
+
+    def child_limit(self, widening_k=None, widening_alpha=0.5):
+        """Most children this node may have so far.
+
+        With progressive widening the cap is ``widening_k * visits **
+        widening_alpha`` (at least one); without it, every legal move.
+        """
+        if widening_k is None:
+            return len(self.children) + len(self.untried_moves)
+        return max(1, int(widening_k * self.visits**widening_alpha))
+
+    def can_expand(self, widening_k=None, widening_alpha=0.5):
+        """Whether another untried move may become a child."""
+        if not self.untried_moves:
+            return False
+        if len(self.children) < self.child_limit(widening_k, widening_alpha):
+            return True
+        # Widen past the cap once every child is proven lost
+        return all(child.proven == LOSS for child in self.children)
+
+    def select_puct(self, c=1.5, can_expand=True, rave_k=None):
+        """Child with the best PUCT score, or None if an untried move scores higher.
+
+        Untried moves are valued at the first-play urgency: this node's own
+        win rate seen from the side to move. They are only considered if
+        ``can_expand``.
+        """
+        best, best_score = None, float("-inf")
+        for child in self.selectable_children():
+            score = child.puct(c, rave_k, self.visits)
+            if score > best_score:
+                best, best_score = child, score
+
+        if can_expand and self.untried_moves:
+            self.score_moves()
+            fpu = 1 - self.wins / self.visits if self.visits else 0.5
+            if fpu + c * self.priors[-1] * math.sqrt(self.visits) >= best_score:
+                return None
+        return best
+
+    def prune(self):
+        """Drop the subtree below this node, keeping its own statistics."""
+        self.children = []
+        self.edge_moves = {}
+        self.untried_moves = list(self.board.legal_moves)
+        self.priors = None
+
     def is_terminal(self):
-        return self.board.is_game_over()
+        return game_outcome(self.board) is not None
+
+    def expand(self, table=None):
+        """Add a child for the next untried move.
 
-    def expand(self):
+        With a ``table`` (Zobrist key and ply to node) a position reached
+        before by another move order is shared instead of duplicated. The
+        ply is part of the key, so the graph can never contain a cycle.
+        """
         move = self.untried_moves.pop()
-        new_board = self.board.copy()
-        new_board.push(move)
-        child_node = Node(new_board, parent=self, move=move)
+        prior = self.priors.pop() if self.priors is not None else 1.0
+
+        child_node = None
+        if table is not None:
+            self.board.push(move)
+            key = (zobrist_key(self.board), self.board.ply())
+            self.board.pop()
+            child_node = table.get(key)
+
+        if child_node is None:
+            new_board = self.board.copy()
+            new_board.push(move)
+            child_node = type(self)(new_board, parent=self, move=move, prior=prior)
+            if table is not None:
+                table[key] = child_node
+
         self.children.append(child_node)
+        self.edge_moves[child_node] = move
         return child_node
 
 
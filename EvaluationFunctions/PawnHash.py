@@ -0,0 +1,52 @@
+import chess
+from typing import Optional
+
+
+class PawnHashTable:
+    """Fixed-size cache of pawn-structure scores keyed on the pawn bitboards.
+
+    Pawn structure rarely changes during a search, so most lookups hit.
+    Colliding entries simply overwrite each other.
+    """
+
+    def __init__(self, size: int = 1 << 14):
+        self.size = size
+        self.keys = [None] * size
+        self.scores = [0.0] * size
+        self.hits = 0
+        self.misses = 0
+
+    def _index(self, white_pawns: chess.Bitboard, black_pawns: chess.Bitboard):
+        return hash((white_pawns, black_pawns)) % self.size
+
+    def probe(
+        self, white_pawns: chess.Bitboard, black_pawns: chess.Bitboard
+    ) -> Optional[float]:
+        """Return the cached score or None."""
+        index = self._index(white_pawns, black_pawns)
+        if self.keys[index] == (white_pawns, black_pawns):
+            self.hits += 1
+            return self.scores[index]
+        self.misses += 1
+        return None
+
+    def store(
+        self, white_pawns: chess.Bitboard, black_pawns: chess.Bitboard, score: float
+    ) -> None:
+        """Cache a score, replacing whatever was in the slot."""
+        index = self._index(white_pawns, black_pawns)
+        self.keys[index] = (white_pawns, black_pawns)
+        self.scores[index] = score
+
+    def clear(self) -> None:
+        self.keys = [None] * self.size
+        self.hits = 0
+        self.misses = 0
+
+
+def pawn_bitboards(board: chess.Board):
+    """Return (white_pawns, black_pawns) bitboards."""
+    return (
+        board.pawns & board.occupied_co[chess.WHITE],
+        board.pawns & board.occupied_co[chess.BLACK],
+    )
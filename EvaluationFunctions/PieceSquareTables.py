@@ -0,0 +1,148 @@
+"""Piece Square Tables (PSTs) shared by the evaluators"""
+
+import chess
+
+
+piece_score = {"K": 0, "Q": 9, "R": 5, "B": 3, "N": 3, "p": 1}
+
+knight_scores = [
+    [0.0, 0.1, 0.2, 0.2, 0.2, 0.2, 0.1, 0.0],
+    [0.1, 0.3, 0.5, 0.5, 0.5, 0.5, 0.3, 0.1],
+    [0.2, 0.5, 0.6, 0.65, 0.65, 0.6, 0.5, 0.2],
+    [0.2, 0.55, 0.65, 0.7, 0.7, 0.65, 0.55, 0.2],
+    [0.2, 0.5, 0.65, 0.7, 0.7, 0.65, 0.5, 0.2],
+    [0.2, 0.55, 0.6, 0.65, 0.65, 0.6, 0.55, 0.2],
+    [0.1, 0.3, 0.5, 0.55, 0.55, 0.5, 0.3, 0.1],
+    [0.0, 0.1, 0.2, 0.2, 0.2, 0.2, 0.1, 0.0],
+]
+
+bishop_scores = [
+    [0.0, 0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.0],
+    [0.2, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.2],
+    [0.2, 0.4, 0.5, 0.6, 0.6, 0.5, 0.4, 0.2],
+    [0.2, 0.5, 0.5, 0.6, 0.6, 0.5, 0.5, 0.2],
+    [0.2, 0.4, 0.6, 0.6, 0.6, 0.6, 0.4, 0.2],
+    [0.2, 0.6, 0.6, 0.6, 0.6, 0.6, 0.6, 0.2],
+    [0.2, 0.5, 0.4, 0.4, 0.4, 0.4, 0.5, 0.2],
+    [0.0, 0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.0],
+]
+
+rook_scores = [
+    [0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25],
+    [0.5, 0.75, 0.75, 0.75, 0.75, 0.75, 0.75, 0.5],
+    [0.0, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.0],
+    [0.0, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.0],
+    [0.0, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.0],
+    [0.0, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.0],
+    [0.0, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.0],
+    [0.25, 0.25, 0.25, 0.5, 0.5, 0.25, 0.25, 0.25],
+]
+
+queen_scores = [
+    [0.0, 0.2, 0.2, 0.3, 0.3, 0.2, 0.2, 0.0],
+    [0.2, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.2],
+    [0.2, 0.4, 0.5, 0.5, 0.5, 0.5, 0.4, 0.2],
+    [0.3, 0.4, 0.5, 0.5, 0.5, 0.5, 0.4, 0.3],
+    [0.4, 0.4, 0.5, 0.5, 0.5, 0.5, 0.4, 0.3],
+    [0.2, 0.5, 0.5, 0.5, 0.5, 0.5, 0.4, 0.2],
+    [0.2, 0.4, 0.5, 0.4, 0.4, 0.4, 0.4, 0.2],
+    [0.0, 0.2, 0.2, 0.3, 0.3, 0.2, 0.2, 0.0],
+]
+
+pawn_scores = [
+    [0.8, 0.8, 0.8, 0.8, 0.8, 0.8, 0.8, 0.8],
+    [0.7, 0.7, 0.7, 0.7, 0.7, 0.7, 0.7, 0.7],
+    [0.3, 0.3, 0.4, 0.5, 0.5, 0.4, 0.3, 0.3],
+    [0.25, 0.25, 0.3, 0.45, 0.45, 0.3, 0.25, 0.25],
+    [0.2, 0.2, 0.2, 0.4, 0.4, 0.2, 0.2, 0.2],
+    [0.25, 0.15, 0.1, 0.2, 0.2, 0.1, 0.15, 0.25],
+    [0.25, 0.3, 0.3, 0.0, 0.0, 0.3, 0.3, 0.25],
+    [0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.2],
+]
+
+# Centipawn piece values by game phase
+piece_values = {
+    chess.PAWN: 100,
+    chess.KNIGHT: 320,
+    chess.BISHOP: 330,
+    chess.ROOK: 500,
+    chess.QUEEN: 900,
+    chess.KING: 20000,
+}
+
+endgame_piece_values = {
+    chess.PAWN: 150,
+    chess.KNIGHT: 280,
+    chess.BISHOP: 350,
+    chess.ROOK: 525,
+    chess.QUEEN: 1000,
+    chess.KING: 20000,
+}
+
+# Plain material count in pawn units
+material_values = {
+    chess.PAWN: 1,
+    chess.KNIGHT: 3,
+    chess.BISHOP: 3,
+    chess.ROOK: 5,
+    chess.QUEEN: 9,
+}
+
+piece_to_table = {
+    chess.KNIGHT: knight_scores,
+    chess.BISHOP: bishop_scores,
+    chess.ROOK: rook_scores,
+    chess.QUEEN: queen_scores,
+    chess.PAWN: pawn_scores,
+}
+
+# Endgame variants: pawns gain value as they advance and the king heads
+# for the centre; the other pieces keep their tables
+pawn_endgame_scores = [
+    [0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0],
+    [0.1, 0.1, 0.1, 0.1, 0.1, 0.1, 0.1, 0.1],
+    [0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.2],
+    [0.3, 0.3, 0.3, 0.3, 0.3, 0.3, 0.3, 0.3],
+    [0.45, 0.45, 0.45, 0.45, 0.45, 0.45, 0.45, 0.45],
+    [0.6, 0.6, 0.6, 0.6, 0.6, 0.6, 0.6, 0.6],
+    [0.8, 0.8, 0.8, 0.8, 0.8, 0.8, 0.8, 0.8],
+    [0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0],
+]
+
+king_endgame_scores = [
+    [0.0, 0.1, 0.2, 0.2, 0.2, 0.2, 0.1, 0.0],
+    [0.1, 0.2, 0.3, 0.3, 0.3, 0.3, 0.2, 0.1],
+    [0.2, 0.3, 0.4, 0.45, 0.45, 0.4, 0.3, 0.2],
+    [0.2, 0.3, 0.45, 0.5, 0.5, 0.45, 0.3, 0.2],
+    [0.2, 0.3, 0.45, 0.5, 0.5, 0.45, 0.3, 0.2],
+    [0.2, 0.3, 0.4, 0.45, 0.45, 0.4, 0.3, 0.2],
+    [0.1, 0.2, 0.3, 0.3, 0.3, 0.3, 0.2, 0.1],
+    [0.0, 0.1, 0.2, 0.2, 0.2, 0.2, 0.1, 0.0],
+]
+
+endgame_piece_to_table = {
+    **piece_to_table,
+    chess.PAWN: pawn_endgame_scores,
+    chess.KING: king_endgame_scores,
+}
+
+
+def _flatten(tables):
+    """One 64-entry tuple per (color, piece_type), indexed by square.
+
+    Row ``r`` of a table is rank ``r`` for White; Black reads it mirrored.
+    Pieces without a table score 0 everywhere.
+    """
+    flat = {}
+    for piece_type in chess.PIECE_TYPES:
+        rows = tables.get(piece_type, [[0.0] * 8] * 8)
+        flat[(chess.WHITE, piece_type)] = tuple(v for row in rows for v in row)
+        flat[(chess.BLACK, piece_type)] = tuple(
+            v for row in reversed(rows) for v in row
+        )
+    return flat
+
+
+# Positional bonus in pawn units from the owner's point of view
+PST_MIDGAME = _flatten(piece_to_table)
+PST_ENDGAME = _flatten(endgame_piece_to_table)
@@ -0,0 +1,171 @@
+import chess
+import random
+from typing import List, Optional, Tuple
+
+"""Fast random playouts for the MCTS simulation step"""
+
+
+def is_insufficient_material(board: chess.Board) -> bool:
+    """Bare kings, or a single minor piece left: cheap piece-count check."""
+    if board.pawns | board.rooks | board.queens:
+        return False
+    return chess.popcount(board.occupied) <= 3
+
+
+def has_legal_move(board: chess.Board) -> bool:
+    """True as soon as one legal move is found."""
+    return any(True for _ in board.generate_legal_moves())
+
+
+def _pseudo_legal_targets(board: chess.Board, captures_only: bool):
+    """Pseudo-legal moves as (targets, from_square, delta) groups.
+
+    Each piece gives one group with a fixed ``from_square``; the pawns give
+    set-wise push and capture groups whose moves start at ``to - delta``.
+    """
+    color = board.turn
+    own = board.occupied_co[color]
+    enemy = board.occupied_co[not color]
+    groups = []
+
+    pawns = board.pawns & own
+    if pawns:
+        pawn_enemy = enemy
+        if board.ep_square is not None:
+            pawn_enemy |= chess.BB_SQUARES[board.ep_square]
+        empty = ~board.occupied & chess.BB_ALL
+        if color == chess.WHITE:
+            single = (pawns << 8) & empty
+            double = ((single & chess.BB_RANK_3) << 8) & empty
+            west = (pawns << 7) & ~chess.BB_FILE_H & pawn_enemy
+            east = (pawns << 9) & ~chess.BB_FILE_A & pawn_enemy
+            steps = (8, 16, 7, 9)
+        else:
+            single = (pawns >> 8) & empty
+            double = ((single & chess.BB_RANK_6) >> 8) & empty
+            west = (pawns >> 9) & ~chess.BB_FILE_H & pawn_enemy
+            east = (pawns >> 7) & ~chess.BB_FILE_A & pawn_enemy
+            steps = (-8, -16, -9, -7)
+        if captures_only:
+            single = double = 0
+        for targets, delta in zip((single, double, west, east), steps):
+            if targets:
+                groups.append((targets, None, delta))
+
+    mask = ~enemy if not captures_only else 0
+    for square in chess.scan_reversed(own & ~board.pawns):
+        targets = board.attacks_mask(square) & ~own & (enemy | mask)
+        if targets:
+            groups.append((targets, square, 0))
+    return groups
+
+
+def _draw_move(board: chess.Board, captures_only: bool, rng) -> Optional[chess.Move]:
+    # Counting target bits is much cheaper than building a Move object for
+    # every pseudo-legal move
+    groups = [list(group) for group in _pseudo_legal_targets(board, captures_only)]
+    castles = []
+    back_rank = chess.BB_RANK_1 if board.turn == chess.WHITE else chess.BB_RANK_8
+    if not captures_only and board.castling_rights & back_rank:
+        castles = list(board.generate_castling_moves())
+
+    total = len(castles) + sum(chess.popcount(group[0]) for group in groups)
+    while total:
+        index = rng.randrange(total)
+        if index < len(castles):
+            move = castles.pop(index)
+        else:
+            index -= len(castles)
+            for group in groups:
+                count = chess.popcount(group[0])
+                if index < count:
+                    break
+                index -= count
+            targets, from_square, delta = group
+            for to_square in chess.scan_forward(targets):
+                if not index:
+                    break
+                index -= 1
+
+            # Discard the drawn move whether or not it turns out legal
+            group[0] = targets & ~chess.BB_SQUARES[to_square]
+            promotion = None
+            if from_square is None:
+                from_square = to_square - delta
+                if chess.BB_SQUARES[to_square] & chess.BB_BACKRANKS:
+                    promotion = chess.QUEEN
+            move = chess.Move(from_square, to_square, promotion)
+
+        if not board.is_into_check(move):
+            return move
+        total -= 1
+    return None
+
+
+def pick_move(
+    board: chess.Board, capture_bias: float = 0.0, rng=random
+) -> Optional[chess.Move]:
+    """Pick a random legal move, or None if there is none.
+
+    Moves are drawn uniformly from the pseudo-legal moves and only the drawn
+    move is checked for legality; an illegal draw is discarded and the draw
+    repeats. Pawns always promote to a queen. With probability
+    ``capture_bias`` the draw is limited to captures, if there are any.
+    """
+    if capture_bias and rng.random() < capture_bias:
+        move = _draw_move(board, True, rng)
+        if move is not None:
+            return move
+    return _draw_move(board, False, rng)
+
+
+def _no_moves_result(board: chess.Board) -> float:
+    """Result from White's point of view when the side to move is stuck."""
+    if board.is_check():
+        return 0.0 if board.turn == chess.WHITE else 1.0
+    return 0.5
+
+
+def plain_copy(board: chess.Board) -> chess.Board:
+    """Copy without move stack into a plain chess.Board.
+
+    Subclasses such as IncrementalBoard pay for bookkeeping on every push;
+    scoring the final position once from scratch is cheaper.
+    """
+    copy = chess.Board(None, chess960=board.chess960)
+    chess._BoardState(board).restore(copy)
+    return copy
+
+
+def playout(
+    board: chess.Board,
+    max_plies: int,
+    capture_bias: float = 0.0,
+    rng=random,
+    played: Optional[List[chess.Move]] = None,
+) -> Tuple[chess.Board, Optional[float]]:
+    """Play up to ``max_plies`` random moves on a copy of ``board``.
+
+    Returns the final board and the game result from White's point of view
+    (1.0, 0.5 or 0.0), or None if the game did not end. Only mate,
+    stalemate, insufficient material and the 75-move rule are detected;
+    fivefold repetition cannot happen within a short playout. The moves
+    played are appended to ``played`` if given.
+    """
+    board = plain_copy(board)
+    for _ in range(max_plies):
+        if is_insufficient_material(board) or board.halfmove_clock >= 150:
+            return board, 0.5
+        move = pick_move(board, capture_bias, rng)
+        if move is None:
+            return board, _no_moves_result(board)
+        board.push(move)
+        if played is not None:
+            played.append(move)
+
+    if is_insufficient_material(board) or board.halfmove_clock >= 150:
+        return board, 0.5
+    # At the horizon only a position in check is worth testing for mate
+    if board.is_check() and not has_legal_move(board):
+        return board, _no_moves_result(board)
+    return board, None
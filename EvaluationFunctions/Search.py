@@ -0,0 +1,538 @@
+import chess
+import gc
+import math
+import multiprocessing
+import tracemalloc
+from EvaluationFunctions.Node import Node
+from EvaluationFunctions.IncrementalBoard import IncrementalBoard, zobrist_key
+from EvaluationFunctions.Rollout import playout, plain_copy
+
+"""Monte Carlo tree search loop shared by the MCTS engines"""
+
+
+class MCTSSearch:
+    """Selection, expansion, simulation and backpropagation.
+
+    Subclasses provide ``evaluate(board)``, a score from White's point of
+    view, and may override ``_normalize`` to map it into [0, 1]. Node values
+    are kept from the point of view of the player who made the node's move,
+    so every parent picks the child with the highest win rate.
+
+    With ``transpositions`` the tree becomes a DAG: nodes are shared by
+    Zobrist key and ply, and every backup follows the path actually
+    selected, so a shared node is updated once per simulation through it.
+
+    ``max_nodes`` and ``max_bytes`` cap the tree, the latter measured with
+    tracemalloc. At the cap the search stops expanding and keeps refining
+    the existing leaves, or with ``prune`` first collapses the
+    least-visited subtrees back to a quarter under the cap.
+
+    With ``leaf_batch`` above 1 each round selects that many paths, adding
+    a virtual loss along each so the next selection looks elsewhere, and
+    scores all the leaves in one ``_simulate_and_evaluate_batch`` call:
+    a NumPy batch evaluator, or a pool of ``workers`` processes.
+
+    Terminal nodes back up their exact result without a playout. With the
+    solver on, proven results also propagate up the tree: proven-lost
+    children are no longer selected, and the search stops as soon as the
+    root is proven.
+    """
+
+    node_class = Node
+
+    def __init__(
+        self,
+        search_depth=10,
+        batch_size=1,
+        capture_bias=0.0,
+        selection="ucb1",
+        c_puct=1.5,
+        widening_k=None,
+        widening_alpha=0.5,
+        rave_k=None,
+        solver=True,
+        early_stop=True,
+        stop_confidence=None,
+        transpositions=False,
+        max_nodes=None,
+        max_bytes=None,
+        prune=False,
+        leaf_batch=1,
+        virtual_loss=1,
+        workers=0,
+    ):
+        self.search_depth = search_depth
+        self.iterations = 1000
+        # Leaves expanded and scored together per iteration (1 = classic MCTS)
+        self.batch_size = batch_size
+        # Selections per round, kept apart by virtual loss and scored as one
+        # batch, optionally by a pool of worker processes
+        self.leaf_batch = leaf_batch
+        self.virtual_loss = virtual_loss
+        self.workers = workers
+        self.pool = None
+        # Chance that a playout move is drawn from the captures only
+        self.capture_bias = capture_bias
+        # "ucb1", or "puct" to steer selection with move priors
+        self.selection = selection
+        self.c_puct = c_puct
+        # Progressive widening: at most k * N^alpha children, best prior first
+        self.widening_k = widening_k
+        self.widening_alpha = widening_alpha
+        # RAVE: visits at which AMAF and own statistics weigh about the same
+        self.rave_k = rave_k
+        self.rollout_moves = []  # Moves of each playout of this iteration
+        # MCTS-solver: propagate proven wins, losses and draws
+        self.solver = solver
+        # Stop once the rest of the budget cannot change the root decision,
+        # or (with stop_confidence) once the leader is ahead beyond doubt
+        self.early_stop = early_stop
+        self.stop_confidence = stop_confidence
+        self.iterations_run = 0
+        self.iterations_saved = 0
+        # Share nodes between transposed move orders (MCTS DAG)
+        self.transpositions = transpositions
+        self.table = None
+        self.node_count = 0
+        # Tree budget, and what the last search used
+        self.max_nodes = max_nodes
+        self.max_bytes = max_bytes
+        self.prune = prune
+        self.peak_nodes = 0
+        self.pruned_nodes = 0
+        self.tree_bytes = None
+        self.peak_tree_bytes = None
+        self.memory_base = 0
+
+    def get_move(self, board):
+        # Tree memory is measured while tracemalloc is on, and a byte budget
+        # turns it on for the duration of the search
+        started_tracing = self.max_bytes is not None and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        try:
+            return self._search(board)
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+
+    def _search(self, board):
+        self.tree_bytes = self.peak_tree_bytes = None
+        if tracemalloc.is_tracing():
+            self.memory_base = tracemalloc.get_traced_memory()[0]
+        root = self.node_class(IncrementalBoard.from_board(board))
+        self.node_count = self.peak_nodes = 1
+        self.pruned_nodes = 0
+        self.table = {} if self.transpositions else None
+        if self.table is not None:
+            self.table[(zobrist_key(root.board), root.board.ply())] = root
+
+        iterations = 0
+        while iterations < self.iterations:
+            # A root proven at creation (75-move rule, dead position) still
+            # needs its children for a move to play
+            if self.solver and root.proven is not None and root.children:
+                break
+            if self.early_stop and self._decision_settled(
+                root, self.iterations - iterations
+            ):
+                break
+            if self.prune and self._over_budget():
+                self._prune_tree(root)
+
+            # Selection and expansion of up to leaf_batch paths; virtual loss
+            # steers each selection away from the paths already taken
+            leaves, paths = [], []
+            while len(leaves) < self.leaf_batch:
+                new_leaves, new_paths = self._select_and_expand(
+                    root, self.iterations - iterations - len(leaves)
+                )
+                if not new_leaves:
+                    break  # Nothing left to select this round
+                leaves += new_leaves
+                paths += new_paths
+                if self.leaf_batch > 1:
+                    for path in new_paths:
+                        self._apply_virtual_loss(path, self.virtual_loss)
+                if iterations + len(leaves) >= self.iterations:
+                    break
+            if self.leaf_batch > 1:
+                for path in paths:
+                    self._apply_virtual_loss(path, -self.virtual_loss)
+            if not leaves:
+                break  # Nothing could be selected: stop rather than spin
+
+            # Simulation + Evaluation; proven leaves back up their exact value
+            pending = [leaf for leaf in leaves if leaf.proven is None]
+            self.rollout_moves = []
+            if len(pending) == 1:
+                scores = [self._simulate_and_evaluate(pending[0].board)]
+            elif pending:
+                scores = self._simulate_and_evaluate_batch(
+                    [leaf.board for leaf in pending]
+                )
+            else:
+                scores = []
+            scores = iter(scores)
+            rollouts = iter(self.rollout_moves)
+
+            # Backpropagation with evaluation score
+            for leaf, leaf_path in zip(leaves, paths):
+                if leaf.proven is not None:
+                    result, played = leaf.proven, []
+                else:
+                    result, played = next(scores), next(rollouts, [])
+                self._backpropagate(leaf_path, result)
+                if self.rave_k is not None:
+                    self._update_amaf(leaf_path, result, played)
+                if self.solver:
+                    self._propagate_proof(leaf_path)
+            iterations += len(leaves)
+
+        self._measure_tree()
+        self.iterations_run = iterations
+        self.iterations_saved = self.iterations - iterations
+        if self.solver and root.proven is not None and root.children:
+            # Play the proven result: a forced win, else the best proven line
+            best = max(
+                root.children,
+                key=lambda n: (n.proven if n.proven is not None else -1, n.visits),
+            )
+            return root.move_to(best)
+        return self._select_best_move(root)
+
+    def search_stats(self):
+        """Iteration counts and tree size of the last search.
+
+        Tree bytes are None unless tracemalloc was tracing during the search.
+        """
+        return {
+            "iterations": self.iterations_run,
+            "iterations_saved": self.iterations_saved,
+            "nodes": self.node_count,
+            "peak_nodes": self.peak_nodes,
+            "pruned_nodes": self.pruned_nodes,
+            "tree_bytes": self.tree_bytes,
+            "peak_tree_bytes": self.peak_tree_bytes,
+        }
+
+    def _measure_tree(self):
+        """Update the tree size counters; return the tree bytes, if traced."""
+        self.peak_nodes = max(self.peak_nodes, self.node_count)
+        if not tracemalloc.is_tracing():
+            return None
+        self.tree_bytes = tracemalloc.get_traced_memory()[0] - self.memory_base
+        self.peak_tree_bytes = max(self.peak_tree_bytes or 0, self.tree_bytes)
+        return self.tree_bytes
+
+    def _over_budget(self, fraction=1.0):
+        """Whether the tree has reached ``fraction`` of a node or byte budget."""
+        if self.max_nodes is not None and self.node_count >= fraction * self.max_nodes:
+            return True
+        if self.max_bytes is not None:
+            tree_bytes = self._measure_tree()
+            return tree_bytes is not None and tree_bytes >= fraction * self.max_bytes
+        return False
+
+    def _prune_tree(self, root):
+        """Collapse the least-visited subtrees until the tree is 3/4 of the budget.
+
+        A collapsed node keeps its statistics and proof, and is expanded
+        again if selection comes back to it. A subtree holds at most one
+        node per visit, so visits bound what each collapse frees.
+        """
+        before = self.node_count
+        while self._over_budget(0.75):
+            expanded = [
+                node
+                for node in self._tree_nodes(root)
+                if node.children and node is not root
+            ]
+            if not expanded:
+                break
+            if self.max_nodes is not None:
+                excess = self.node_count - 0.75 * self.max_nodes
+            else:
+                excess = self.node_count * (1 - 0.75 * self.max_bytes / self.tree_bytes)
+            expanded.sort(key=lambda node: node.visits)
+            freed = 0
+            for node in expanded:
+                if freed >= max(excess, 1):
+                    break
+                freed += node.visits
+                node.prune()
+
+            nodes = self._tree_nodes(root)
+            if self.table is not None:
+                self.table = {
+                    key: node for key, node in self.table.items() if node in nodes
+                }
+            self.node_count = len(nodes)
+            if self.max_bytes is not None:
+                # Parent links form cycles; free them before measuring again
+                gc.collect()
+        self.pruned_nodes += before - self.node_count
+
+    def _tree_nodes(self, root):
+        """Every node reachable from root."""
+        seen = {root}
+        stack = [root]
+        while stack:
+            for child in stack.pop().children:
+                if child not in seen:
+                    seen.add(child)
+                    stack.append(child)
+        return seen
+
+    def _decision_settled(self, root, remaining):
+        """Whether ``remaining`` more iterations cannot change the chosen move.
+
+        The move is picked by visits in PUCT mode and by win rate otherwise;
+        the check assumes every remaining iteration goes against the leader.
+        """
+        children = root.selectable_children()
+        if not children:
+            return False
+        if len(children) == 1 and not root.untried_moves:
+            return True
+
+        if self.selection == "puct":
+            visits = sorted((child.visits for child in children), reverse=True)
+            runner_up = visits[1] if len(visits) > 1 else 0
+            return visits[0] - runner_up > remaining
+
+        if root.untried_moves:
+            return False  # An unvisited move could still come out on top
+        leader = max(children, key=lambda n: n.wins / n.visits)
+        others = [child for child in children if child is not leader]
+
+        worst = leader.wins / (leader.visits + remaining)
+        if all((n.wins + remaining) / (n.visits + remaining) < worst for n in others):
+            return True
+
+        if self.stop_confidence is None:
+            return False
+        # Hoeffding bounds on each win rate
+        log_term = math.log(1 / (1 - self.stop_confidence))
+
+        def radius(node):
+            return math.sqrt(log_term / (2 * node.visits))
+
+        low = leader.wins / leader.visits - radius(leader)
+        return all(n.wins / n.visits + radius(n) < low for n in others)
+
+    def _propagate_proof(self, path):
+        """Prove ancestors of a newly proven node, as far as possible."""
+        if path[-1].proven is None:
+            return
+        for node in reversed(path[:-1]):
+            if node.proven is None:
+                node.proven = node.solve()
+            if node.proven is None:
+                return
+
+    def _select_and_expand(self, root, remaining):
+        """Select a node and expand up to batch_size of its untried children.
+
+        Returns the new leaves and their paths from the root, or the
+        selected node itself if it cannot be expanded.
+        """
+        path = self._select(root)
+        node = path[-1]
+        if not self._can_expand(node):
+            return [node], [path]
+        count = min(self.batch_size, self._expansion_slots(node), remaining)
+        if count < 1:
+            return [node], [path]
+        leaves = [self._expand(node) for _ in range(count)]
+        return leaves, [path + [leaf] for leaf in leaves]
+
+    def _apply_virtual_loss(self, path, loss):
+        """Count ``loss`` pending lost visits on a path (negative to undo).
+
+        Each node then looks worse to the parent that picks it, so the
+        next selections of a round spread over other paths.
+        """
+        for node in path:
+            node.visits += loss
+
+    def _expand(self, node):
+        """Expand one untried move of node, sharing transposed positions."""
+        count = len(self.table) if self.table is not None else 0
+        child = node.expand(self.table)
+        if self.table is None or len(self.table) > count:
+            self.node_count += 1
+            self.peak_nodes = max(self.peak_nodes, self.node_count)
+        return child
+
+    def _can_expand(self, node):
+        # At the cap deepen the existing leaves instead; the root always
+        # expands so there is a move to play
+        if node.parent is not None and self._over_budget():
+            return False
+        return node.can_expand(self.widening_k, self.widening_alpha)
+
+    def _expansion_slots(self, node):
+        """How many untried moves may be expanded at once."""
+        if self.widening_k is not None:
+            # Widening takes children in prior order
+            node.score_moves()
+        limit = node.child_limit(self.widening_k, self.widening_alpha)
+        # Once every child is proven lost, widening allows one more past the cap
+        return min(len(node.untried_moves), max(1, limit - len(node.children)))
+
+    def _select(self, node):
+        """Descend from the root; return the path to the node to expand or simulate."""
+        path = [node]
+        if self.selection == "puct":
+            while node.proven is None:
+                node = node.select_puct(
+                    self.c_puct, self._can_expand(node), self.rave_k
+                )
+                if node is None:
+                    break
+                path.append(node)
+            return path
+
+        while (
+            node.proven is None
+            and not self._can_expand(node)
+            and node.children != []
+        ):
+            node = self._select_child(node)
+            path.append(node)
+        return path
+
+    def _select_child(self, node):
+        return max(
+            node.selectable_children(),
+            key=lambda n: n.ucb1(rave_k=self.rave_k, parent_visits=node.visits),
+        )
+
+    def _select_best_move(self, root):
+        if self.selection == "puct":
+            # Visit counts are the robust choice once priors shape the tree
+            best_child = max(root.selectable_children(), key=lambda n: n.visits)
+            return root.move_to(best_child)
+
+        # Choose best move based on win rate rather than just visits
+        best_child = max(
+            root.selectable_children(),
+            key=lambda n: n.wins / n.visits if n.visits > 0 else 0,
+        )
+        return root.move_to(best_child)
+
+    def _backpropagate(self, path, result):
+        """Add a simulation result to every node on the selected path."""
+        for node in reversed(path):
+            node.visits += 1
+            node.wins += result
+            result = 1 - result  # Flip result for opponent's perspective
+
+    def _update_amaf(self, path, result, rollout):
+        """Credit every move played below each path node to the matching child.
+
+        A move counts for a node if the side to move there played it, at
+        its first occurrence, anywhere later in the tree path or playout.
+        """
+        moves = [
+            parent.move_to(child) for parent, child in zip(path, path[1:])
+        ] + list(rollout)
+
+        for index, node in enumerate(path[:-1]):
+            # result is for the player who moved into the leaf
+            mover_result = result if (len(path) - 1 - index) % 2 else 1 - result
+            children = {move: child for child, move in node.edge_moves.items()}
+            seen = set()
+            for move in moves[index::2]:
+                if move in seen:
+                    continue
+                seen.add(move)
+                child = children.get(move)
+                if child is not None:
+                    child.amaf_visits += 1
+                    child.amaf_wins += mover_result
+
+    def _playout(self, board):
+        """Play random moves from a copy of board; return it and any game result."""
+        played = [] if self.rave_k is not None else None
+        # Legality is only checked for the chosen moves
+        final, result = playout(
+            board, self.search_depth, self.capture_bias, played=played
+        )
+        if played is not None:
+            self.rollout_moves.append(played)
+        return final, result
+
+    def _normalize(self, score):
+        """Convert a White-relative score to a [0,1] result for White."""
+        # Convert score to probability using sigmoid-like function
+        return 1 / (1 + 10 ** (-score / 10))
+
+    def _for_mover(self, board, result):
+        """Turn a result for White into one for the player who moved into board."""
+        return result if board.turn == chess.BLACK else 1 - result
+
+    def _simulate_and_evaluate(self, board):
+        """Simulate game to fixed depth and evaluate final position."""
+        final, result = self._playout(board)
+
+        # Otherwise evaluate the position and normalize to [0,1]
+        if result is None:
+            result = self._normalize(self.evaluate(final))
+
+        return self._for_mover(board, result)
+
+    def _simulate_and_evaluate_batch(self, boards):
+        """Simulate and score several leaves, in the worker pool if there is one."""
+        if self.workers < 2:
+            return [self._simulate_and_evaluate(board) for board in boards]
+
+        if self.pool is None:
+            self.pool = multiprocessing.Pool(
+                self.workers, initializer=_init_worker, initargs=(self,)
+            )
+        outcomes = self.pool.map(
+            _simulate_in_worker, [plain_copy(board) for board in boards]
+        )
+        self.rollout_moves = [played for _, played in outcomes]
+        return [score for score, _ in outcomes]
+
+    def close(self):
+        """Stop the worker pool, if one was started."""
+        if self.pool is None:
+            return
+        self.pool.terminate()
+        self.pool.join()
+        self.pool = None
+
+    def __getstate__(self):
+        # Workers get a copy of the engine without the pool or the tree
+        state = self.__dict__.copy()
+        state["pool"] = None
+        state["table"] = None
+        return state
+
+    def __del__(self):
+        self.close()
+
+    def evaluate(self, board):
+        """Public method to expose position evaluation."""
+        raise NotImplementedError
+
+
+_worker_engine = None
+
+
+def _init_worker(engine):
+    """Keep the worker's copy of the engine for the simulations it is sent."""
+    global _worker_engine
+    _worker_engine = engine
+
+
+def _simulate_in_worker(board):
+    """Score one leaf in a worker; return the score and the playout moves."""
+    _worker_engine.rollout_moves = []
+    score = _worker_engine._simulate_and_evaluate(board)
+    played = _worker_engine.rollout_moves
+    return score, played[0] if played else []
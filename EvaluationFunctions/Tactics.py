@@ -0,0 +1,298 @@
+import chess
+
+from EvaluationFunctions.Bitboards import pawn_attacks
+
+
+# Piece values used for exchange evaluation (centipawns)
+SEE_VALUES = {
+    chess.PAWN: 100,
+    chess.KNIGHT: 320,
+    chess.BISHOP: 330,
+    chess.ROOK: 500,
+    chess.QUEEN: 900,
+    chess.KING: 20000,
+}
+
+PIECE_ORDER = [
+    chess.PAWN,
+    chess.KNIGHT,
+    chess.BISHOP,
+    chess.ROOK,
+    chess.QUEEN,
+    chess.KING,
+]
+
+
+def _least_valuable_attacker(
+    board: chess.Board, attackers: chess.Bitboard, color: chess.Color
+):
+    """Return (square, piece_type) of the cheapest attacker in the mask."""
+    for piece_type in PIECE_ORDER:
+        subset = attackers & board.pieces_mask(piece_type, color)
+        if subset:
+            return chess.lsb(subset), piece_type
+    return None, None
+
+
+def see_square(
+    board: chess.Board,
+    from_square: chess.Square,
+    to_square: chess.Square,
+    promotion: chess.PieceType = None,
+) -> int:
+    """Static exchange evaluation of a capture sequence on one square.
+
+    Returns the expected material gain (centipawns) for the side owning the
+    piece on ``from_square``, assuming both sides keep recapturing with their
+    least valuable attacker while it pays off.
+    """
+    attacker_type = board.piece_type_at(from_square)
+    if attacker_type is None:
+        return 0
+    color = board.color_at(from_square)
+
+    occupied = board.occupied ^ chess.BB_SQUARES[from_square]
+    target_type = board.piece_type_at(to_square)
+    if (
+        target_type is None
+        and attacker_type == chess.PAWN
+        and to_square == board.ep_square
+    ):
+        # En passant: the captured pawn is not on the target square
+        target_type = chess.PAWN
+        down = -8 if color == chess.WHITE else 8
+        occupied ^= chess.BB_SQUARES[to_square + down]
+
+    gains = [SEE_VALUES[target_type] if target_type else 0]
+    on_square = attacker_type
+    if promotion:
+        gains[0] += SEE_VALUES[promotion] - SEE_VALUES[chess.PAWN]
+        on_square = promotion
+
+    side = not color
+    while True:
+        attackers = board.attackers_mask(side, to_square, occupied) & occupied
+        if not attackers:
+            break
+        square, piece_type = _least_valuable_attacker(board, attackers, side)
+
+        # The king may only recapture if the square is no longer defended
+        if piece_type == chess.KING:
+            occupied_after = occupied ^ chess.BB_SQUARES[square]
+            defenders = board.attackers_mask(not side, to_square, occupied_after)
+            if defenders & occupied_after:
+                break
+
+        # Stop, without counting it, once the capture cannot change the result
+        gain = SEE_VALUES[on_square] - gains[-1]
+        if max(-gains[-1], gain) < 0:
+            break
+        gains.append(gain)
+
+        occupied ^= chess.BB_SQUARES[square]
+        on_square = piece_type
+        side = not side
+
+    # Negamax the swap list back to the first capture
+    for depth in range(len(gains) - 1, 0, -1):
+        gains[depth - 1] = -max(-gains[depth - 1], gains[depth])
+
+    return gains[0]
+
+
+def see(board: chess.Board, move: chess.Move) -> int:
+    """Static exchange evaluation of a move in centipawns."""
+    return see_square(board, move.from_square, move.to_square, move.promotion)
+
+
+def _cheapest_captures(board: chess.Board, color: chess.Color, threshold: int):
+    """Captures ``color`` could make, after cheap mask tests.
+
+    Returns True if some capture surely gains at least ``threshold``: the
+    victim is worth that much more than the capturer, or is worth it and
+    undefended. Otherwise returns the cheapest capturer of each attacked
+    piece, as {to_square: from_square}, which only SEE can settle.
+    """
+    them = not color
+    targets = board.occupied_co[them] & ~board.kings
+    pending = {}
+    if not targets:
+        return pending
+
+    def settle(from_square, to_square, value):
+        gain = SEE_VALUES[board.piece_type_at(to_square)]
+        if gain - value >= threshold:
+            return True  # Wins enough even if recaptured
+        if gain >= threshold:
+            # Defenders once the capturer has left its square (x-rays)
+            occupied = board.occupied ^ chess.BB_SQUARES[from_square]
+            if not board.attackers_mask(them, to_square, occupied) & occupied:
+                return True
+        cheapest = pending.get(to_square)
+        if cheapest is None or value < SEE_VALUES[board.piece_type_at(cheapest)]:
+            pending[to_square] = from_square
+        return False
+
+    # Pawns first, all at once: most captures they make win outright
+    pawns = board.pawns & board.occupied_co[color]
+    pawn_value = SEE_VALUES[chess.PAWN]
+    for to_square in chess.scan_forward(pawn_attacks(board, color) & targets):
+        from_square = chess.lsb(chess.BB_PAWN_ATTACKS[them][to_square] & pawns)
+        if settle(from_square, to_square, pawn_value):
+            return True
+
+    for from_square in chess.scan_forward(board.occupied_co[color] & ~pawns):
+        attacks = board.attacks_mask(from_square) & targets
+        if not attacks:
+            continue
+        value = SEE_VALUES[board.piece_type_at(from_square)]
+        for to_square in chess.scan_forward(attacks):
+            if settle(from_square, to_square, value):
+                return True
+    return pending
+
+
+def _has_en_passant(board: chess.Board) -> bool:
+    """Whether a pawn of the side to move attacks the en passant square."""
+    if board.ep_square is None:
+        return False
+    us = board.turn
+    pawns = board.pawns & board.occupied_co[us]
+    return bool(pawns & chess.BB_PAWN_ATTACKS[not us][board.ep_square])
+
+
+def hanging_pieces(board: chess.Board, color: chess.Color) -> chess.Bitboard:
+    """Bitboard of pieces of ``color`` the opponent can win by capturing."""
+    hanging = 0
+    opponent = not color
+    targets = board.occupied_co[color] & ~board.kings
+
+    for square in chess.scan_forward(targets):
+        attackers = board.attackers_mask(opponent, square)
+        if not attackers:
+            continue
+
+        from_square, piece_type = _least_valuable_attacker(board, attackers, opponent)
+        # Attacked by a cheaper piece, or undefended: no need for SEE
+        if SEE_VALUES[piece_type] < SEE_VALUES[board.piece_type_at(square)]:
+            hanging |= chess.BB_SQUARES[square]
+            continue
+        occupied = board.occupied ^ chess.BB_SQUARES[from_square]
+        if (
+            not board.attackers_mask(color, square, occupied) & occupied
+            or see_square(board, from_square, square) > 0
+        ):
+            hanging |= chess.BB_SQUARES[square]
+
+    return hanging
+
+
+def has_winning_capture(board: chess.Board, threshold: int = 0) -> bool:
+    """Check if the side to move has a capture with SEE >= threshold."""
+    pending = _cheapest_captures(board, board.turn, threshold)
+    if pending is True or _has_en_passant(board):
+        return True
+    return any(
+        see_square(board, from_square, to_square) >= threshold
+        for to_square, from_square in pending.items()
+    )
+
+
+def has_promotion(board: chess.Board) -> bool:
+    """Check if the side to move has a pawn that can promote next move."""
+    us = board.turn
+    seventh = chess.BB_RANK_7 if us == chess.WHITE else chess.BB_RANK_2
+    pawns = board.pawns & board.occupied_co[us] & seventh
+    if not pawns:
+        return False
+
+    if us == chess.WHITE:
+        pushes = (pawns << 8) & ~board.occupied
+    else:
+        pushes = (pawns >> 8) & ~board.occupied
+    return bool(pushes & chess.BB_ALL)
+
+
+def is_tactical_position(board: chess.Board) -> bool:
+    """Cheap detector for positions that need a quiescence search.
+
+    Only looks at the current position: checks, non-losing captures,
+    promotions and pieces of the side to move that are en prise.
+    """
+    if board.is_check() or has_promotion(board):
+        return True
+
+    # Mask tests for both sides first; SEE only on what they leave open
+    ours = _cheapest_captures(board, board.turn, 0)
+    if ours is True or _has_en_passant(board):
+        return True
+    theirs = _cheapest_captures(board, not board.turn, 1)
+    if theirs is True:
+        return True
+
+    for to_square, from_square in ours.items():
+        if see_square(board, from_square, to_square) >= 0:
+            return True
+    for to_square, from_square in theirs.items():
+        if see_square(board, from_square, to_square) > 0:
+            return True
+    return False
+
+
+def mvv_lva(board: chess.Board, move: chess.Move) -> int:
+    """Most valuable victim / least valuable attacker ordering key."""
+    if board.is_en_passant(move):
+        victim = chess.PAWN
+    else:
+        victim = board.piece_type_at(move.to_square)
+    attacker = board.piece_type_at(move.from_square)
+    victim_value = SEE_VALUES[victim] if victim else 0
+    if move.promotion:
+        victim_value += SEE_VALUES[move.promotion] - SEE_VALUES[chess.PAWN]
+    return victim_value * 10 - attacker
+
+
+def staged_captures(
+    board: chess.Board, min_gain: int = None, include_checks: bool = True
+):
+    """Lazily yield quiescence moves in stages.
+
+    Winning captures come first in MVV-LVA order, then equal exchanges, then
+    (optionally) quiet checks. Captures that lose material by SEE, or whose
+    SEE gain is below ``min_gain`` (delta pruning), are never yielded. SEE
+    only runs on a capture once the search reaches it, so a cutoff skips
+    the rest; the board must be back in this position at each resumption.
+    """
+    us = board.turn
+    promotion_squares = chess.BB_RANK_8 if us == chess.WHITE else chess.BB_RANK_1
+    targets = board.occupied_co[not us] | promotion_squares
+    if board.ep_square is not None:
+        targets |= chess.BB_SQUARES[board.ep_square]
+
+    captures = []
+    for move in board.generate_legal_moves(to_mask=targets):
+        if move.promotion and move.promotion != chess.QUEEN:
+            continue
+        if move.promotion or board.is_capture(move):
+            captures.append(move)
+    captures.sort(key=lambda m: mvv_lva(board, m), reverse=True)
+
+    equal = []
+    for move in captures:
+        gain = see(board, move)
+        if gain < 0:
+            continue
+        if min_gain is not None and gain < min_gain:
+            continue
+
+        if gain > 0:
+            yield move
+        else:
+            equal.append(move)
+
+    yield from equal
+
+    if include_checks and not board.is_check():
+        for move in board.generate_legal_moves(to_mask=~targets & chess.BB_ALL):
+            if board.gives_check(move):
+                yield move
@@ -3,6 +3,7 @@ from EvaluationFunctions.MCTS.KingSafety import MCTSEngine as KingEngine
 from EvaluationFunctions.MCTS.MaterialBalance import MCTSEngine as MaterialEngine
 from EvaluationFunctions.MCTS.PawnStructure import MCTSEngine as PawnEngine
 from EvaluationFunctions.MCTS.PST import MCTSEngine as PSTEngine
+from EvaluationFunctions.GameStatus import RepetitionHistory, game_outcome
 
 import chess
 import time
@@ -31,6 +32,8 @@ class Tournament:
                 "losses": 0,
                 "draws": 0,
                 "eval_times": [],
+                "tree_nodes": [],
+                "tree_bytes": [],
             }
             for name in self.engines.keys()
         }
@@ -55,7 +58,10 @@ class Tournament:
         with tqdm(
             total=max_moves, desc=f"Match {engine1_name} vs {engine2_name}", unit="move"
         ) as pbar:
-            while not board.is_game_over() and move_count < max_moves:
+            # Cheap game-over check, with repetitions from an incremental history
+            history = RepetitionHistory(board)
+            outcome = game_outcome(board, history=history)
+            while outcome is None and move_count < max_moves:
                 # Measure evaluation time
                 start_time = time.time()
                 move = current_engine.get_move(board)
@@ -64,8 +70,18 @@ class Tournament:
                 # Record evaluation time
                 self.stats[current_engine_name]["eval_times"].append(eval_time)
 
+                # Record search tree size (bytes only while tracemalloc runs)
+                search = current_engine.search_stats()
+                self.stats[current_engine_name]["tree_nodes"].append(search["nodes"])
+                if search["peak_tree_bytes"] is not None:
+                    self.stats[current_engine_name]["tree_bytes"].append(
+                        search["peak_tree_bytes"]
+                    )
+
                 # Make the move
                 board.push(move)
+                history.push(board)
+                outcome = game_outcome(board, history=history)
 
                 # Update the progress bar
                 pbar.update(1)
@@ -81,7 +97,7 @@ class Tournament:
                 move_count += 1
 
         # Check if the game was undecided within max_moves
-        if move_count >= max_moves and not board.is_game_over():
+        if outcome is None:
             # Treat it as a draw
             self.stats[engine1_name]["draws"] += 1
             self.stats[engine2_name]["draws"] += 1
@@ -90,7 +106,7 @@ class Tournament:
             return "1/2-1/2"
 
         # Record game result if decided
-        result = board.result()
+        result = outcome.result()
         if result == "1-0":
             self.stats[engine1_name]["wins"] += 1
             self.stats[engine2_name]["losses"] += 1
@@ -163,6 +179,12 @@ class Tournament:
                     "Draws": stats["draws"],
                     "Win Rate": f"{win_rate:.2f}%",
                     "Avg Eval Time": f"{avg_eval_time:.3f}s",
+                    "Max Tree Nodes": max(stats["tree_nodes"], default=0),
+                    "Max Tree Memory": (
+                        f"{max(stats['tree_bytes']) / 2**20:.1f}MB"
+                        if stats["tree_bytes"]
+                        else "-"
+                    ),
                 }
             )
 
@@ -0,0 +1,32 @@
+import chess
+from EvaluationFunctions.IncrementalBoard import IncrementalBoard
+from EvaluationFunctions.Negmax.PST import ImprovedChessEngine
+
+ITALIAN = "r1bqk1nr/pppp1ppp/2n5/2b1p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4"
+
+
+def test_null_move_fires_on_zero_window():
+    engine = ImprovedChessEngine(use_tt=False)
+    board = IncrementalBoard.from_board(chess.Board(ITALIAN))
+    engine.pv_table = [[] for _ in range(5)]
+    # A zero window built the way PVS builds it; White is far above it
+    alpha = -5.3
+    beta = alpha + engine.NULL_WINDOW
+    engine.find_move_negamax_alpha_beta(board, None, 4, alpha, beta, 1)
+    assert engine.null_move_cutoffs > 0
+
+
+def test_null_move_fires_in_search():
+    engine = ImprovedChessEngine(depth=5)
+    move = engine.get_move(chess.Board(ITALIAN))
+    assert move is not None
+    assert engine.search_stats()["null_move_cutoffs"] > 0
+
+
+def test_lmr_without_pvs():
+    nodes = []
+    for use_lmr in (False, True):
+        engine = ImprovedChessEngine(depth=4, use_pvs=False, use_lmr=use_lmr)
+        engine.get_move(chess.Board(ITALIAN))
+        nodes.append(engine.search_stats()["nodes"])
+    assert nodes[1] < nodes[0]
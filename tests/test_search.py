@@ -0,0 +1,64 @@
+import chess
+from EvaluationFunctions.MCTS import Combined
+from EvaluationFunctions.MCTS.PST import MCTSEngine
+
+# Back-rank position: with a one-child widening cap the search reaches
+# nodes whose every child is proven lost
+ALL_LOST = "6k1/5ppp/8/8/8/2q5/1P3PPP/3R2K1 b - - 0 1"
+# Drawn by the 75-move rule, so the root is proven before it has children
+SEVENTY_FIVE_MOVES = "8/8/3k4/8/8/2QK4/8/8 w - - 150 200"
+
+
+def _search(fen, iterations=300, **options):
+    engine = MCTSEngine(**options)
+    engine.iterations = iterations
+    board = chess.Board(fen)
+    move = engine.get_move(board)
+    assert move in board.legal_moves
+    return engine, move
+
+
+def _allows_mate_in_one(fen, move):
+    board = chess.Board(fen)
+    board.push(move)
+    for reply in list(board.legal_moves):
+        board.push(reply)
+        mate = board.is_checkmate()
+        board.pop()
+        if mate:
+            return True
+    return False
+
+
+def test_widening_past_lost_children_ucb1():
+    # 8 of Black's 30 moves lose to Rd8#; the proven losses must be avoided
+    _, move = _search(ALL_LOST, widening_k=1)
+    assert not _allows_mate_in_one(ALL_LOST, move)
+
+
+def test_widening_past_lost_children_puct():
+    _, move = _search(ALL_LOST, widening_k=1, selection="puct")
+    assert not _allows_mate_in_one(ALL_LOST, move)
+
+
+def test_widening_past_lost_children_leaf_batch():
+    _, move = _search(ALL_LOST, widening_k=1, leaf_batch=4)
+    assert not _allows_mate_in_one(ALL_LOST, move)
+
+
+def test_root_proven_at_creation():
+    engine = Combined.MCTSEngine()
+    engine.iterations = 50
+    board = chess.Board(SEVENTY_FIVE_MOVES)
+    assert engine.get_move(board) in board.legal_moves
+
+
+def test_prune_with_tiny_node_budget():
+    engine, _ = _search(chess.STARTING_FEN, 100, max_nodes=1, prune=True)
+    # Only the root and its children are left
+    assert engine.search_stats()["nodes"] <= 21
+
+
+def test_prune_with_tiny_byte_budget():
+    engine, _ = _search(chess.STARTING_FEN, 50, max_bytes=2000, prune=True)
+    assert engine.search_stats()["peak_tree_bytes"] is not None
@@ -0,0 +1,26 @@
+import chess
+from EvaluationFunctions.Tactics import is_tactical_position, see
+
+
+def _see(fen, uci):
+    board = chess.Board(fen)
+    return see(board, chess.Move.from_uci(uci))
+
+
+def test_see_undefended_pawn():
+    assert _see("1k1r4/1pp4p/p7/4p3/8/P5P1/1PP4P/2K1R3 w - - 0 1", "e1e5") == 100
+
+
+def test_see_textbook_exchange():
+    # Nxe5 loses the knight for a pawn after the full swap-off
+    fen = "1k1r3q/1ppn3p/p4b2/4p3/8/P2N2P1/1PP1R1BP/2K1Q3 w - - 0 1"
+    assert _see(fen, "d3e5") == -220
+
+
+def test_tactical_position_needs_material_at_stake():
+    # Only defended pawns are attacked: no capture wins anything
+    quiet = "r1bqk1nr/pppp1ppp/2n5/2b1p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4"
+    assert not is_tactical_position(chess.Board(quiet))
+    # The knight on c6 is attacked by a pawn
+    threat = "r1bqk1nr/pppp1ppp/2n5/1Pb1p3/2B1P3/5N2/P1PP1PPP/RNBQK2R b KQkq - 0 5"
+    assert is_tactical_position(chess.Board(threat))